@@ -5,7 +5,7 @@ from .auth_models import *
 __all__ = [
     # University models
     'UniversityResponse', 'UniversityListResponse', 'SearchSuggestionResponse', 
-    'CountriesResponse', 'StatisticsResponse',
+    'CountriesResponse', 'StatisticsResponse', 'OverviewResponse',
     # Auth models
     'UserSignUpRequest', 'UserSignInRequest', 'UserResponse', 'AuthResponse',
     'RefreshTokenRequest', 'PasswordResetRequest', 'PasswordUpdateRequest',
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import Optional
 
 class UserSignUpRequest(BaseModel):
@@ -11,9 +11,16 @@ class UserSignUpRequest(BaseModel):
 
 class UserSignInRequest(BaseModel):
     """User login request model"""
-    email: EmailStr
+    # Plain str: Supabase rejects unknown addresses anyway, so skip the
+    # EmailStr parser on the hot sign-in path
+    email: str
     password: str
 
+    @field_validator("email", mode="before")
+    @classmethod
+    def _normalize_email(cls, v):
+        return v.strip().lower() if isinstance(v, str) else v
+
 class UserResponse(BaseModel):
     """User response model"""
     id: str
@@ -24,6 +24,7 @@ class UniversityListResponse(BaseModel):
     page: int
     per_page: int
     pages: int
+    estimated: bool = False  # True when total is the planner's row estimate
 
 class SearchSuggestionResponse(BaseModel):
     id: str
@@ -38,4 +39,9 @@ class StatisticsResponse(BaseModel):
     total_universities: int
     total_countries: int
     with_website: int
-    with_domain: int 
\ No newline at end of file
+    with_domain: int 
+
+
+class OverviewResponse(BaseModel):
+    statistics: StatisticsResponse
+    countries: List[str]
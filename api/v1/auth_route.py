@@ -7,7 +7,9 @@ from ..models.auth_models import (
     RefreshTokenRequest, PasswordResetRequest, PasswordUpdateRequest,
     UserProfileUpdateRequest
 )
-from services.auth_service import AuthService
+from services.auth_service import get_auth_service
+from core.middleware import verify_token
+from core.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -17,21 +19,21 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
 
 # Initialize auth service
-auth_service = AuthService()
+auth_service = get_auth_service()
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user"""
     try:
         token = credentials.credentials
-        return auth_service.get_current_user(token)
-    except Exception as e:
+        return await verify_token(token)
+    except Exception:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid access token",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-@router.post("/signup", response_model=AuthResponse)
+@router.post("/signup", responses={200: {"model": AuthResponse}})
 async def sign_up(user_data: UserSignUpRequest):
     """Register a new user account"""
     try:
@@ -43,18 +45,18 @@ async def sign_up(user_data: UserSignUpRequest):
             role=user_data.role
         )
         
-        return AuthResponse(
-            user=UserResponse(**result["user"]),
+        return ORJSONResponse(content=AuthResponse.model_construct(
+            user=UserResponse.model_construct(**result["user"]),
             access_token=result["access_token"],
             refresh_token=result["refresh_token"]
-        )
+        ).model_dump())
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Sign up error: {e}")
+        logger.error("Sign up error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/signin", response_model=AuthResponse)
+@router.post("/signin", responses={200: {"model": AuthResponse}})
 async def sign_in(user_data: UserSignInRequest):
     """Sign in with existing user account"""
     try:
@@ -63,37 +65,41 @@ async def sign_in(user_data: UserSignInRequest):
             password=user_data.password
         )
         
-        return AuthResponse(
-            user=UserResponse(**result["user"]),
+        return ORJSONResponse(content=AuthResponse.model_construct(
+            user=UserResponse.model_construct(**result["user"]),
             access_token=result["access_token"],
             refresh_token=result["refresh_token"]
-        )
+        ).model_dump())
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Sign in error: {e}")
+        logger.error("Sign in error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/signout")
-async def sign_out(current_user: dict = Depends(get_current_user)):
+async def sign_out(
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+):
     """Sign out the current user"""
+    await auth_service.sign_out(credentials.credentials)
     return {"message": "Successfully signed out"}
 
-@router.post("/refresh", response_model=AuthResponse)
+@router.post("/refresh", responses={200: {"model": AuthResponse}})
 async def refresh_token(refresh_data: RefreshTokenRequest):
     """Refresh access token using refresh token"""
     try:
         result = await auth_service.refresh_token(refresh_data.refresh_token)
         
-        return AuthResponse(
-            user=UserResponse(**result["user"]),
+        return ORJSONResponse(content=AuthResponse.model_construct(
+            user=UserResponse.model_construct(**result["user"]),
             access_token=result["access_token"],
             refresh_token=result["refresh_token"]
-        )
+        ).model_dump())
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Refresh token error: {e}")
+        logger.error("Refresh token error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.post("/reset-password")
@@ -105,48 +111,50 @@ async def reset_password(reset_data: PasswordResetRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Password reset error: {e}")
+        logger.error("Password reset error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.put("/update-password")
 async def update_password(
     password_data: PasswordUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Update user password"""
     try:
-        await auth_service.update_password("", password_data.password)
+        await auth_service.update_password(credentials.credentials, password_data.password)
         return {"message": "Password updated successfully"}
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Update password error: {e}")
+        logger.error("Update password error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.put("/profile", response_model=UserResponse)
+@router.put("/profile", responses={200: {"model": UserResponse}})
 async def update_profile(
     profile_data: UserProfileUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
 ):
     """Update user profile information"""
     try:
         result = await auth_service.update_profile(
-            "",
+            credentials.credentials,
             first_name=profile_data.first_name,
             last_name=profile_data.last_name
         )
         
-        return UserResponse(**result)
+        return ORJSONResponse(content=UserResponse.model_construct(**result).model_dump())
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Update profile error: {e}")
+        logger.error("Update profile error: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/me", response_model=UserResponse)
+@router.get("/me", responses={200: {"model": UserResponse}})
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """Get current user information"""
-    return UserResponse(**current_user)
+    return ORJSONResponse(content=UserResponse.model_construct(**current_user).model_dump())
 
 @router.get("/health")
 async def auth_health_check():
@@ -1,20 +1,42 @@
+import asyncio
+from itertools import chain
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from models.university_models import (
+from uuid import UUID
+from ..models.university_models import (
     UniversityResponse, 
     UniversityListResponse, 
     SearchSuggestionResponse,
     CountriesResponse, 
-    StatisticsResponse
+    StatisticsResponse,
+    OverviewResponse
 )
 from services.university_service import UniversityService
+from core.responses import ORJSONResponse, iter_json_array
+from core.coalescing import run_coalesced
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/universities", tags=["universities"])
 
-@router.get("/", response_model=UniversityListResponse)
+def _stream_universities(items, rows, country_code):
+    """
+    JSON array body for a streamed listing. The status line is already sent,
+    so a database error mid-stream can only be logged and the response cut
+    short; either way the cursor's session is closed when the body ends.
+    """
+    try:
+        yield from iter_json_array(items)
+    except Exception as e:
+        logger.error("Error streaming universities for country %s: %s", country_code, e)
+        raise
+    finally:
+        rows.close()
+
+@router.get("/", responses={200: {"model": UniversityListResponse}})
 async def get_universities(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
@@ -34,7 +56,8 @@ async def get_universities(
     - **sort_order**: Sort order (asc, desc)
     """
     try:
-        result = UniversityService.get_universities_with_pagination(
+        result = await run_in_threadpool(
+            UniversityService.get_universities_with_pagination,
             page=page,
             per_page=per_page,
             search=search,
@@ -42,30 +65,30 @@ async def get_universities(
             sort_by=sort_by,
             sort_order=sort_order
         )
-        return UniversityListResponse(**result)
+        return ORJSONResponse(content=result)
     except Exception as e:
-        logger.error(f"Error getting universities: {e}")
+        logger.error("Error getting universities: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/{university_id}", response_model=UniversityResponse)
-async def get_university(university_id: str):
+@router.get("/{university_id:uuid}", responses={200: {"model": UniversityResponse}})
+async def get_university(university_id: UUID):
     """
     Get a specific university by ID.
     
     - **university_id**: University UUID
     """
     try:
-        university = UniversityService.get_university_by_id(university_id)
+        university = await run_in_threadpool(UniversityService.get_university_by_id, university_id)
         if not university:
             raise HTTPException(status_code=404, detail="University not found")
-        return university
+        return ORJSONResponse(content=university)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting university {university_id}: {e}")
+        logger.error("Error getting university %s: %s", university_id, e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/search/suggestions", response_model=List[SearchSuggestionResponse])
+@router.get("/search/suggestions", responses={200: {"model": List[SearchSuggestionResponse]}})
 async def get_search_suggestions(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
@@ -80,43 +103,62 @@ async def get_search_suggestions(
     - **country_code**: Optional country filter
     """
     try:
-        suggestions = UniversityService.get_search_suggestions(
+        # Autocomplete fires many identical queries at once; share one lookup
+        suggestions = await run_coalesced(
+            ("suggestions", q, limit, country_code),
+            UniversityService.get_search_suggestions,
             query=q,
             limit=limit,
             country_code=country_code
         )
-        return [SearchSuggestionResponse(**suggestion) for suggestion in suggestions]
+        return ORJSONResponse(content=suggestions)
     except Exception as e:
-        logger.error(f"Error getting search suggestions: {e}")
+        logger.error("Error getting search suggestions: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/countries", response_model=CountriesResponse)
+@router.get("/countries", responses={200: {"model": CountriesResponse}})
 async def get_countries():
     """
     Get list of countries that have universities.
     Useful for country filter dropdown.
     """
     try:
-        countries = UniversityService.get_countries()
-        return CountriesResponse(countries=countries)
+        countries = await run_in_threadpool(UniversityService.get_countries)
+        return ORJSONResponse(content={"countries": countries})
     except Exception as e:
-        logger.error(f"Error getting countries: {e}")
+        logger.error("Error getting countries: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/statistics", response_model=StatisticsResponse)
+@router.get("/statistics", responses={200: {"model": StatisticsResponse}})
 async def get_statistics():
     """
     Get university statistics.
     Useful for dashboard or overview pages.
     """
     try:
-        stats = UniversityService.get_statistics()
-        return StatisticsResponse(**stats)
+        stats = await run_in_threadpool(UniversityService.get_statistics)
+        return ORJSONResponse(content=stats)
     except Exception as e:
-        logger.error(f"Error getting statistics: {e}")
+        logger.error("Error getting statistics: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/country/{country_code}", response_model=List[UniversityResponse])
+@router.get("/overview", responses={200: {"model": OverviewResponse}})
+async def get_overview():
+    """
+    Get statistics and the country list in one response.
+    Both are fetched concurrently, so a dashboard needs a single request.
+    """
+    try:
+        stats, countries = await asyncio.gather(
+            run_in_threadpool(UniversityService.get_statistics),
+            run_in_threadpool(UniversityService.get_countries)
+        )
+        return ORJSONResponse(content={"statistics": stats, "countries": countries})
+    except Exception as e:
+        logger.error("Error getting overview: %s", e)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/country/{country_code}", responses={200: {"model": List[UniversityResponse]}})
 async def get_universities_by_country(
     country_code: str,
     search: Optional[str] = Query(None, description="Search term for university name")
@@ -126,13 +168,34 @@ async def get_universities_by_country(
     
     - **country_code**: Country code (e.g., "US", "CA")
     - **search**: Optional search term
+
+    Unfiltered listings can run to thousands of rows, so they are streamed
+    from a server-side cursor instead of being built in memory.
     """
+    if not search:
+        rows = UniversityService.iter_universities_by_country(country_code)
+        try:
+            # Run the query and fetch the first row before any bytes are
+            # sent, so a failing query still gets a proper 500
+            first = await run_in_threadpool(next, rows, None)
+        except Exception as e:
+            rows.close()
+            logger.error("Error getting universities for country %s: %s", country_code, e)
+            raise HTTPException(status_code=500, detail="Internal server error")
+        if first is None:
+            return ORJSONResponse(content=[])
+        return StreamingResponse(
+            _stream_universities(chain((first,), rows), rows, country_code),
+            media_type="application/json"
+        )
     try:
-        universities = UniversityService.get_universities_by_country(
+        universities = await run_coalesced(
+            ("by_country", country_code, search),
+            UniversityService.get_universities_by_country,
             country_code=country_code,
             search=search
         )
-        return universities
+        return ORJSONResponse(content=universities)
     except Exception as e:
-        logger.error(f"Error getting universities for country {country_code}: {e}")
+        logger.error("Error getting universities for country %s: %s", country_code, e)
         raise HTTPException(status_code=500, detail="Internal server error") 
\ No newline at end of file
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable
+
+from fastapi.concurrency import run_in_threadpool
+
+
+# In-flight calls by key. Everything runs on the event loop, so plain dict
+# access needs no lock.
+_inflight: Dict[Hashable, asyncio.Future] = {}
+
+
+async def run_coalesced(key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call in the threadpool, sharing it among concurrent callers.
+
+    While a call for `key` is in flight, later callers with the same key await
+    its result instead of issuing their own, so a burst of identical requests
+    costs one database round-trip. Nothing is kept once the call finishes;
+    results must not be mutated by callers, since they are shared.
+    """
+    future = _inflight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+        _inflight[key] = future
+        future.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded: one caller disconnecting must not cancel the call for the rest
+    return await asyncio.shield(future)
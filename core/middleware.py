@@ -1,14 +1,53 @@
-from fastapi import Request, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import Request
+from fastapi.security import HTTPBearer
 from typing import Optional
+from cachetools import TTLCache
+from jose import jwt, JWTError
+import hashlib
 import logging
+import time
 
-from services.auth_service import AuthService
+from services.auth_service import get_auth_service
 
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
-auth_service = AuthService()
+auth_service = get_auth_service()
+
+# Verified tokens -> (user, deadline). Keys are short digests so the cache
+# never holds raw bearer tokens; entries never outlive the JWT's own exp,
+# and a signed-out token is re-checked (and rejected) instead of served.
+TOKEN_CACHE_TTL = 60
+_token_cache = TTLCache(maxsize=10_000, ttl=TOKEN_CACHE_TTL)
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+def _token_cache_deadline(token: str, now: float) -> float:
+    """Latest time a verified token may be served from cache"""
+    try:
+        exp = jwt.get_unverified_claims(token).get("exp")
+    except JWTError:
+        exp = None
+    deadline = now + TOKEN_CACHE_TTL
+    return min(deadline, exp) if isinstance(exp, (int, float)) else deadline
+
+async def verify_token(token: str) -> dict:
+    """
+    Resolve a bearer token to its user, serving recently verified tokens from
+    cache. Raises like AuthService.get_current_user for invalid tokens.
+    """
+    now = time.time()
+    key = _token_cache_key(token)
+    cached = _token_cache.get(key)
+    if cached and cached[1] > now and not auth_service.is_token_revoked(token):
+        return cached[0]
+    
+    user = await auth_service.get_current_user(token)
+    deadline = _token_cache_deadline(token, now)
+    if deadline > now:
+        _token_cache[key] = (user, deadline)
+    return user
 
 async def get_current_user(request: Request) -> Optional[dict]:
     """
@@ -26,11 +65,10 @@ async def get_current_user(request: Request) -> Optional[dict]:
             return None
         
         # Get user from token
-        user = await auth_service.get_current_user(token)
-        return user
+        return await verify_token(token)
         
     except Exception as e:
-        logger.error(f"Auth middleware error: {e}")
+        logger.error("Auth middleware error: %s", e)
         return None
 
 def require_auth(func):
@@ -0,0 +1,38 @@
+from decimal import Decimal
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not encode natively (UUID/datetime are native)"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    return str(obj)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib json module"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def iter_json_array(items: Iterable[Any], batch_size: int = 500) -> Iterator[bytes]:
+    """
+    Encode an iterable as one JSON array, `batch_size` items per chunk.
+    Intended as the body of a StreamingResponse for large result sets.
+    """
+    iterator = iter(items)
+    separator = b""
+    yield b"["
+    while batch := list(islice(iterator, batch_size)):
+        # Strip the enclosing brackets of each encoded batch
+        yield separator + orjson.dumps(batch, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)[1:-1]
+        separator = b","
+    yield b"]"
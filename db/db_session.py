@@ -1,8 +1,12 @@
 from contextlib import contextmanager
+from functools import wraps
+from sqlalchemy.exc import SQLAlchemyError
 from db.orm_db_manager import DatabaseConnectionManager
 from fastapi import Depends
+import logging
 
-# You may want to use a singleton or global manager
+# Process-wide manager: one engine and connection pool shared by the
+# FastAPI dependencies below and every CRUD class in db/orms
 db_manager = DatabaseConnectionManager(app_name="db/db_session.py")
 
 @contextmanager
@@ -35,3 +39,42 @@ def get_db():
         yield session
     finally:
         session.close()
+
+def transactional(fn):
+    """
+    Run a CRUD method in its own session and commit when it returns.
+    The wrapped method receives the session after cls; on a database error
+    the transaction is rolled back, logged under the method's module logger
+    and re-raised.
+    
+    Pass session=... to run inside a caller's unit of work instead: the
+    method then uses that session as-is and the caller commits or rolls back.
+    """
+    @wraps(fn)
+    def wrapper(cls, *args, session=None, **kwargs):
+        if session is not None:
+            return fn(cls, session, *args, **kwargs)
+        with cls.db_manager.get_session() as session:
+            try:
+                result = fn(cls, session, *args, **kwargs)
+                session.commit()
+                return result
+            except SQLAlchemyError as e:
+                session.rollback()
+                logging.getLogger(fn.__module__).error("%s error: %s", fn.__qualname__, e)
+                raise
+    return wrapper
+
+def readonly(fn):
+    """Like transactional, for methods that only read: nothing is committed"""
+    @wraps(fn)
+    def wrapper(cls, *args, session=None, **kwargs):
+        if session is not None:
+            return fn(cls, session, *args, **kwargs)
+        with cls.db_manager.get_session() as session:
+            try:
+                return fn(cls, session, *args, **kwargs)
+            except SQLAlchemyError as e:
+                logging.getLogger(fn.__module__).error("%s error: %s", fn.__qualname__, e)
+                raise
+    return wrapper
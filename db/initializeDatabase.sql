@@ -4,11 +4,28 @@ CREATE EXTENSION IF NOT EXISTS citext;    -- case-insensitive text for domain
 CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 
+-- Time-ordered UUIDv7 (RFC 9562): a millisecond timestamp prefix over
+-- gen_random_uuid()'s random bits, so new keys land at the right edge of the
+-- primary-key btree instead of splitting pages all over it
+CREATE OR REPLACE FUNCTION uuid_generate_v7()
+RETURNS uuid AS $$
+  SELECT encode(
+    set_bit(
+      set_bit(
+        overlay(uuid_send(gen_random_uuid())
+                placing substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                FROM 1 FOR 6),
+        52, 1),
+      53, 1),
+    'hex')::uuid;
+$$ LANGUAGE sql VOLATILE;
+
+
 -- =========================================
 -- Universities (global baseline)
 -- =========================================
 CREATE TABLE public.universities (
-  id               UUID PRIMARY KEY DEFAULT gen_random_uuid(),      -- unique identifier
+  id               UUID PRIMARY KEY DEFAULT uuid_generate_v7(),     -- unique identifier, time-ordered
   name             TEXT NOT NULL,                                   -- university name
   country_code     CHAR(2) NOT NULL,                                -- ISO 3166-1 alpha-2 (e.g., US/GB/AU)
   state_province   TEXT,                                            -- state/province (nullable)
@@ -19,7 +36,9 @@ CREATE TABLE public.universities (
   external_ids     JSONB  DEFAULT '{}'::JSONB,                      -- external IDs (e.g., {"openalex":"...","ror":"...","scorecard":"..."})
   apply_portals    JSONB  DEFAULT '[]'::JSONB,                      -- application portals (e.g., [{"type":"common_app","url":"..."}])
   created_at       TIMESTAMPTZ DEFAULT NOW(),                       -- creation timestamp
-  updated_at       TIMESTAMPTZ DEFAULT NOW()                        -- last update timestamp (maintained by trigger below)
+  updated_at       TIMESTAMPTZ DEFAULT NOW(),                       -- last update timestamp (maintained by trigger below)
+  name_tsv         TSVECTOR GENERATED ALWAYS AS (to_tsvector('simple', coalesce(name, ''))) STORED,  -- full-text tokens for multi-word name search
+  content_hash     BYTEA                                            -- digest of the last synced source payload; unchanged rows skip the upsert
 );
 
 -- Trigger function to automatically update updated_at
@@ -41,6 +60,9 @@ CREATE INDEX IF NOT EXISTS idx_universities_country_code ON public.universities(
 CREATE INDEX IF NOT EXISTS idx_universities_created_at ON public.universities(created_at);
 CREATE INDEX IF NOT EXISTS gin_universities_name_trgm ON public.universities USING gin (name gin_trgm_ops);
 CREATE INDEX IF NOT EXISTS idx_universities_domain ON public.universities(domain);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_universities_name_country_no_domain ON public.universities (lower(name), country_code) WHERE domain IS NULL;
+CREATE INDEX IF NOT EXISTS gin_universities_name_tsv ON public.universities USING gin (name_tsv);
+CREATE INDEX IF NOT EXISTS idx_universities_lower_name ON public.universities (lower(name), id);  -- serves name-sorted listings
 
 
 -- ========= Enums =========
@@ -73,6 +95,7 @@ CREATE TABLE student_profile (
   target_countries TEXT[],
   intended_majors  TEXT[]
 );
+CREATE INDEX idx_student_grad_year ON student_profile(graduation_year);
 
 -- ========= Parent ↔ Student =========
 CREATE TABLE parent_links (
@@ -128,6 +151,7 @@ CREATE TABLE teacher_profile (
   max_advisees  INTEGER DEFAULT 50,
   created_at    TIMESTAMPTZ DEFAULT NOW()
 );
+CREATE INDEX idx_teacher_subjects_gin ON teacher_profile USING gin (subjects);
 
 -- ========= Teacher ↔ Student =========
 CREATE TABLE teacher_student_links (
@@ -3,20 +3,16 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError
 from dotenv import load_dotenv
-from sqlalchemy.orm import declarative_base
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 # Load environment variables from .env
 load_dotenv()
 
-Base = declarative_base()
+# One engine (and connection pool) per database URL for the whole process,
+# however many managers are constructed
+_engines = {}
 
 class DatabaseConnectionManager:
     """Manages PostgreSQL connections and sessions using SQLAlchemy."""
@@ -25,8 +21,8 @@ class DatabaseConnectionManager:
         self, 
         app_name, 
         database_name=None, 
-        pool_size=5, 
-        max_overflow=20
+        pool_size=20, 
+        max_overflow=10
     ):
         self.pgConfig = {
             'user': os.environ.get('DB_USER'),
@@ -46,16 +42,26 @@ class DatabaseConnectionManager:
         database_url = (
             f"postgresql://{self.pgConfig['user']}:{self.pgConfig['password']}@"
             f"{self.pgConfig['host']}:{self.pgConfig['port']}/{self.database_name}"
-            f"?application_name={self.app_name}"
         )
 
-        self.engine = create_engine(
-            database_url,
-            pool_size=self.pool_size,
-            max_overflow=self.max_overflow,
-            pool_recycle=1000,
-            pool_timeout=30
-        )
+        # The memo key leaves out application_name, so managers for the same
+        # database share one pool whatever their app_name; its connections
+        # report the app_name of the manager that created the engine
+        engine = _engines.get(database_url)
+        if engine is None:
+            engine = create_engine(
+                database_url,
+                connect_args={"application_name": self.app_name},
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_recycle=1800,
+                pool_timeout=30,
+                pool_pre_ping=True,   # transparently replace connections dropped by the server
+                pool_use_lifo=True,   # reuse the most recently returned (warm) connection first
+                query_cache_size=1200  # room for every CRUD statement shape without LRU churn
+            )
+            _engines[database_url] = engine
+        self.engine = engine
         self.SessionLocal = sessionmaker(bind=self.engine)
 
     def get_session(self):
@@ -68,9 +74,14 @@ class DatabaseConnectionManager:
             with self.engine.connect() as connection:
                 logger.info("Connection to PostgreSQL established successfully!")
         except OperationalError as e:
-            logger.error(f"Error: Unable to connect to the database.\n{e}")
+            logger.error("Error: Unable to connect to the database.\n%s", e)
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     # Initialize the DatabaseConnectionManager
     db_manager = DatabaseConnectionManager(app_name="db/orm_db_manager.py")
 
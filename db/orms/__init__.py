@@ -1,7 +1,8 @@
 # ORM models package
 # Import all ORM models here
 
-from .university import University, Base, UniversityCRUD
+from .base import Base
+from .university import University, UniversityCRUD
 from .profiles import Profile, ProfileCRUD
 from .student_profile import StudentProfile, StudentProfileCRUD
 from .teacher_profile import TeacherProfile, TeacherProfileCRUD
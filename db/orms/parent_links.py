@@ -1,108 +1,107 @@
-import os
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Column, ForeignKey, DateTime, func
+from typing import Optional
+from sqlalchemy import ForeignKey, DateTime, func, select, delete, exists, bindparam
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from db.orm_db_manager import DatabaseConnectionManager
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from db.orms.base import Base
+from db.orms.profiles import Profile
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-Base = declarative_base()
-
 class ParentLink(Base):
     __tablename__ = "parent_links"
 
-    parent_user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    student_user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    parent_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    student_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    parent = relationship("Profile", foreign_keys=[parent_user_id])
-    student = relationship("Profile", foreign_keys=[student_user_id])
+    parent: Mapped["Profile"] = relationship("Profile", foreign_keys=[parent_user_id])
+    student: Mapped["Profile"] = relationship("Profile", foreign_keys=[student_user_id])
 
     def __repr__(self):
         return f"<ParentLink(parent_user_id={self.parent_user_id}, student_user_id={self.student_user_id})>"
 
 
+# Eager-load both ends of each link in one extra SELECT ... IN query apiece,
+# fetching only the profile columns callers display
+_PROFILE_SUMMARY_COLUMNS = (Profile.user_id, Profile.first_name, Profile.last_name)
+_LINKED_PROFILES = (
+    selectinload(ParentLink.parent).load_only(*_PROFILE_SUMMARY_COLUMNS),
+    selectinload(ParentLink.student).load_only(*_PROFILE_SUMMARY_COLUMNS),
+)
+
+# Built once at import; each call only binds parameters
+_LINK_EXISTS = select(exists().where(
+    ParentLink.parent_user_id == bindparam("parent_user_id"),
+    ParentLink.student_user_id == bindparam("student_user_id")
+))
+
+
 class ParentLinkCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/parent_links.py",
-        database_name=os.environ.get("DB_NAME")
-    )
+    db_manager = db_manager
 
     @classmethod
-    def get_parent_links_by_parent_id(cls, parent_user_id: str):
+    @readonly
+    def get_parent_links_by_parent_id(cls, session, parent_user_id: str):
         """Get all parent links for a parent"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(ParentLink).filter(ParentLink.parent_user_id == parent_user_id).all()
-        except SQLAlchemyError as e:
-            logger.error(f"ParentLinkCRUD get_parent_links_by_parent_id error: {e}")
-            raise
+        stmt = (
+            select(ParentLink)
+            .options(*_LINKED_PROFILES)
+            .where(ParentLink.parent_user_id == parent_user_id)
+        )
+        return session.scalars(stmt).all()
 
     @classmethod
-    def get_parent_links_by_student_id(cls, student_user_id: str):
+    @readonly
+    def get_parent_links_by_student_id(cls, session, student_user_id: str):
         """Get all parent links for a student"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(ParentLink).filter(ParentLink.student_user_id == student_user_id).all()
-        except SQLAlchemyError as e:
-            logger.error(f"ParentLinkCRUD get_parent_links_by_student_id error: {e}")
-            raise
+        stmt = (
+            select(ParentLink)
+            .options(*_LINKED_PROFILES)
+            .where(ParentLink.student_user_id == student_user_id)
+        )
+        return session.scalars(stmt).all()
 
     @classmethod
-    def create_parent_link(cls, parent_user_id: str, student_user_id: str):
+    @transactional
+    def create_parent_link(cls, session, parent_user_id: str, student_user_id: str):
         """Create a new parent link"""
-        try:
-            with cls.db_manager.get_session() as session:
-                parent_link = ParentLink(
-                    parent_user_id=parent_user_id,
-                    student_user_id=student_user_id
-                )
-                session.add(parent_link)
-                session.commit()
-                return parent_link
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"ParentLinkCRUD create_parent_link error: {e}")
-            raise
+        parent_link = ParentLink(
+            parent_user_id=parent_user_id,
+            student_user_id=student_user_id
+        )
+        session.add(parent_link)
+        return parent_link
 
     @classmethod
-    def delete_parent_link(cls, parent_user_id: str, student_user_id: str):
-        """Delete parent link"""
-        try:
-            with cls.db_manager.get_session() as session:
-                parent_link = session.query(ParentLink).filter(
-                    ParentLink.parent_user_id == parent_user_id,
-                    ParentLink.student_user_id == student_user_id
-                ).first()
-                
-                if not parent_link:
-                    return None
-                
-                session.delete(parent_link)
-                session.commit()
-                return parent_link
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"ParentLinkCRUD delete_parent_link error: {e}")
-            raise
+    @transactional
+    def delete_parent_link(cls, session, parent_user_id: str, student_user_id: str):
+        """Delete parent link in a single DELETE ... RETURNING round-trip"""
+        parent_link = session.execute(
+            delete(ParentLink)
+            .where(
+                ParentLink.parent_user_id == parent_user_id,
+                ParentLink.student_user_id == student_user_id
+            )
+            .returning(ParentLink)
+        ).scalar_one_or_none()
+        
+        if parent_link is None:
+            return None
+        
+        # Detach before commit so the returned row keeps its loaded values
+        session.expunge(parent_link)
+        return parent_link
 
     @classmethod
-    def check_parent_link_exists(cls, parent_user_id: str, student_user_id: str):
+    @readonly
+    def check_parent_link_exists(cls, session, parent_user_id: str, student_user_id: str):
         """Check if parent link exists"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(ParentLink).filter(
-                    ParentLink.parent_user_id == parent_user_id,
-                    ParentLink.student_user_id == student_user_id
-                ).first() is not None
-        except SQLAlchemyError as e:
-            logger.error(f"ParentLinkCRUD check_parent_link_exists error: {e}")
-            raise
+        return bool(session.scalar(
+            _LINK_EXISTS,
+            {"parent_user_id": parent_user_id, "student_user_id": student_user_id}
+        ))
@@ -1,106 +1,112 @@
-import os
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Column, String, DateTime, Enum, func
+from typing import Optional
+from sqlalchemy import String, DateTime, Enum, func, select, update, delete
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
-from db.orm_db_manager import DatabaseConnectionManager
+from sqlalchemy.orm import Mapped, mapped_column
+from db.orms.base import Base
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-Base = declarative_base()
-
 class Profile(Base):
     __tablename__ = "profiles"
 
-    user_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    role = Column(Enum('student', 'parent', 'teacher', name='role_type'), nullable=False)
-    first_name = Column(String(255), nullable=True)
-    last_name = Column(String(255), nullable=True)
-    email = Column(String(255), unique=True, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    role: Mapped[str] = mapped_column(Enum('student', 'parent', 'teacher', name='role_type'), nullable=False)
+    first_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    last_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), unique=True, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
         return f"<Profile(user_id={self.user_id}, role='{self.role}', email='{self.email}')>"
 
 
+# Columns update_* may write; anything else in update_data is ignored
+_UPDATABLE_COLUMNS = frozenset(Profile.__table__.columns.keys())
+
+
 class ProfileCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/profiles.py",
-        database_name=os.environ.get("DB_NAME")
-    )
+    db_manager = db_manager
 
     @classmethod
-    def get_profile_by_user_id(cls, user_id: str):
+    @readonly
+    def get_profile_by_user_id(cls, session, user_id: str):
         """Get profile by user ID"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(Profile).filter(Profile.user_id == user_id).first()
-        except SQLAlchemyError as e:
-            logger.error(f"ProfileCRUD get_profile_by_user_id error: {e}")
-            raise
+        return session.get(Profile, user_id)
+
+    @classmethod
+    @readonly
+    def get_profile_role(cls, session, user_id: str):
+        """Get just the role of a profile, or None if there is no profile"""
+        return session.scalar(select(Profile.role).where(Profile.user_id == user_id))
 
     @classmethod
-    def get_profiles_by_role(cls, role: str):
+    @readonly
+    def get_profiles_by_user_ids(cls, session, user_ids) -> dict:
+        """
+        Get many profiles in one query, keyed by user ID as a string, the
+        form the rest of the CRUD layer passes IDs in.
+        Use this to enrich a list of users instead of one lookup per user;
+        IDs without a profile are simply absent from the result.
+        """
+        if not user_ids:
+            return {}
+        profiles = session.scalars(select(Profile).where(Profile.user_id.in_(set(user_ids))))
+        return {str(profile.user_id): profile for profile in profiles}
+
+    @classmethod
+    @readonly
+    def get_profiles_by_role(cls, session, role: str):
         """Get all profiles by role"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(Profile).filter(Profile.role == role).all()
-        except SQLAlchemyError as e:
-            logger.error(f"ProfileCRUD get_profiles_by_role error: {e}")
-            raise
+        return session.scalars(select(Profile).where(Profile.role == role)).all()
 
     @classmethod
-    def create_profile(cls, profile_data: dict):
+    @transactional
+    def create_profile(cls, session, profile_data: dict):
         """Create a new profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = Profile(**profile_data)
-                session.add(profile)
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"ProfileCRUD create_profile error: {e}")
-            raise
+        profile = Profile(**profile_data)
+        session.add(profile)
+        return profile
 
     @classmethod
-    def update_profile(cls, user_id: str, update_data: dict):
+    @transactional
+    def update_profile(cls, session, user_id: str, update_data: dict):
         """Update profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(Profile).filter(Profile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                for key, value in update_data.items():
-                    if hasattr(profile, key):
-                        setattr(profile, key, value)
-                
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"ProfileCRUD update_profile error: {e}")
-            raise
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            profile = session.get(Profile, user_id)
+            if profile is not None:
+                # Detach before commit so the returned row keeps its loaded values
+                session.expunge(profile)
+            return profile
+        
+        profile = session.execute(
+            update(Profile).where(Profile.user_id == user_id).values(**values).returning(Profile)
+        ).scalar_one_or_none()
+        if profile is None:
+            return None
+        
+        session.expunge(profile)
+        return profile
+
+    @classmethod
+    @transactional
+    def update_profile_shallow(cls, session, user_id: str, update_data: dict):
+        """Update profile without reading it back; returns the number of rows updated"""
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            return 0
+        
+        return session.execute(
+            update(Profile).where(Profile.user_id == user_id).values(**values)
+        ).rowcount
 
     @classmethod
-    def delete_profile(cls, user_id: str):
+    @transactional
+    def delete_profile(cls, session, user_id: str):
         """Delete profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(Profile).filter(Profile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                session.delete(profile)
-                session.commit()
-                return user_id
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"ProfileCRUD delete_profile error: {e}")
-            raise
\ No newline at end of file
+        result = session.execute(delete(Profile).where(Profile.user_id == user_id))
+        return user_id if result.rowcount else None
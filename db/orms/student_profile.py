@@ -1,110 +1,101 @@
-import os
 import uuid
-from typing import List, Optional
-from sqlalchemy import Column, String, Integer, Numeric, ForeignKey, func
+from decimal import Decimal
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import String, Integer, Numeric, ForeignKey, Index, select, update, delete
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from db.orm_db_manager import DatabaseConnectionManager
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from db.orms.base import Base
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from db.orms.profiles import Profile
 
-Base = declarative_base()
+logger = logging.getLogger(__name__)
 
 class StudentProfile(Base):
     __tablename__ = "student_profile"
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    graduation_year = Column(Integer, nullable=True)
-    gpa = Column(Numeric(3, 2), nullable=True)
-    sat_score = Column(Integer, nullable=True)
-    act_score = Column(Integer, nullable=True)
-    target_countries = Column(ARRAY(String), nullable=True)
-    intended_majors = Column(ARRAY(String), nullable=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    graduation_year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    gpa: Mapped[Optional[Decimal]] = mapped_column(Numeric(3, 2), nullable=True)
+    sat_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    act_score: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    target_countries: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True)
+    intended_majors: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), nullable=True)
+
+    __table_args__ = (
+        Index("idx_student_grad_year", "graduation_year"),
+    )
 
     # Relationship
-    profile = relationship("Profile", backref="student_profile")
+    profile: Mapped["Profile"] = relationship("Profile", backref="student_profile")
 
     def __repr__(self):
         return f"<StudentProfile(user_id={self.user_id}, graduation_year={self.graduation_year})>"
 
 
+# Columns update_* may write; anything else in update_data is ignored
+_UPDATABLE_COLUMNS = frozenset(StudentProfile.__table__.columns.keys())
+
+# Columns returned by list reads unless the caller asks for full objects
+_LIST_COLUMNS = (
+    StudentProfile.user_id,
+    StudentProfile.graduation_year,
+    StudentProfile.gpa,
+    StudentProfile.target_countries,
+)
+
+
 class StudentProfileCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/student_profile.py",
-        database_name=os.environ.get("DB_NAME")
-    )
+    db_manager = db_manager
 
     @classmethod
-    def get_student_profile_by_user_id(cls, user_id: str):
+    @readonly
+    def get_student_profile_by_user_id(cls, session, user_id: str):
         """Get student profile by user ID"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(StudentProfile).filter(StudentProfile.user_id == user_id).first()
-        except SQLAlchemyError as e:
-            logger.error(f"StudentProfileCRUD get_student_profile_by_user_id error: {e}")
-            raise
+        return session.get(StudentProfile, user_id)
 
     @classmethod
-    def get_students_by_graduation_year(cls, graduation_year: int):
-        """Get students by graduation year"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(StudentProfile).filter(StudentProfile.graduation_year == graduation_year).all()
-        except SQLAlchemyError as e:
-            logger.error(f"StudentProfileCRUD get_students_by_graduation_year error: {e}")
-            raise
+    @readonly
+    def get_students_by_graduation_year(cls, session, graduation_year: int, eager: bool = False):
+        """Get students by graduation year as (user_id, graduation_year, gpa, target_countries) rows, or full objects if eager"""
+        stmt = select(StudentProfile) if eager else select(*_LIST_COLUMNS)
+        result = session.execute(stmt.where(StudentProfile.graduation_year == graduation_year))
+        return result.scalars().all() if eager else result.all()
 
     @classmethod
-    def create_student_profile(cls, profile_data: dict):
+    @transactional
+    def create_student_profile(cls, session, profile_data: dict):
         """Create a new student profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = StudentProfile(**profile_data)
-                session.add(profile)
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"StudentProfileCRUD create_student_profile error: {e}")
-            raise
+        profile = StudentProfile(**profile_data)
+        session.add(profile)
+        return profile
 
     @classmethod
-    def update_student_profile(cls, user_id: str, update_data: dict):
+    @transactional
+    def update_student_profile(cls, session, user_id: str, update_data: dict):
         """Update student profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(StudentProfile).filter(StudentProfile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                for key, value in update_data.items():
-                    if hasattr(profile, key):
-                        setattr(profile, key, value)
-                
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"StudentProfileCRUD update_student_profile error: {e}")
-            raise
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            profile = session.get(StudentProfile, user_id)
+            if profile is not None:
+                # Detach before commit so the returned row keeps its loaded values
+                session.expunge(profile)
+            return profile
+        
+        profile = session.execute(
+            update(StudentProfile).where(StudentProfile.user_id == user_id).values(**values).returning(StudentProfile)
+        ).scalar_one_or_none()
+        if profile is None:
+            return None
+        
+        session.expunge(profile)
+        return profile
 
     @classmethod
-    def delete_student_profile(cls, user_id: str):
+    @transactional
+    def delete_student_profile(cls, session, user_id: str):
         """Delete student profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(StudentProfile).filter(StudentProfile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                session.delete(profile)
-                session.commit()
-                return user_id
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"StudentProfileCRUD delete_student_profile error: {e}")
-            raise
\ No newline at end of file
+        result = session.execute(delete(StudentProfile).where(StudentProfile.user_id == user_id))
+        return user_id if result.rowcount else None
@@ -1,111 +1,102 @@
-import os
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Column, String, Integer, Text, ForeignKey, DateTime, func
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import Integer, Text, ForeignKey, DateTime, Index, func, select, update, delete
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from db.orm_db_manager import DatabaseConnectionManager
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from db.orms.base import Base
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from db.orms.profiles import Profile
 
-Base = declarative_base()
+logger = logging.getLogger(__name__)
 
 class TeacherProfile(Base):
     __tablename__ = "teacher_profile"
 
-    user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    subjects = Column(ARRAY(String), nullable=True)
-    organization = Column(Text, nullable=True)
-    timezone = Column(Text, nullable=True)
-    bio = Column(Text, nullable=True)
-    max_advisees = Column(Integer, default=50)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    # TEXT[] to match the table, so @> compares like types and can use the GIN index
+    subjects: Mapped[Optional[List[str]]] = mapped_column(ARRAY(Text), nullable=True)
+    organization: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    timezone: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    bio: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    max_advisees: Mapped[Optional[int]] = mapped_column(Integer, default=50)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("idx_teacher_subjects_gin", "subjects", postgresql_using="gin"),
+    )
 
     # Relationship
-    profile = relationship("Profile", backref="teacher_profile")
+    profile: Mapped["Profile"] = relationship("Profile", backref="teacher_profile")
 
     def __repr__(self):
         return f"<TeacherProfile(user_id={self.user_id}, organization='{self.organization}')>"
 
 
+# Columns update_* may write; anything else in update_data is ignored
+_UPDATABLE_COLUMNS = frozenset(TeacherProfile.__table__.columns.keys())
+
+# Columns returned by list reads unless the caller asks for full objects
+_LIST_COLUMNS = (
+    TeacherProfile.user_id,
+    TeacherProfile.subjects,
+    TeacherProfile.organization,
+    TeacherProfile.max_advisees,
+)
+
+
 class TeacherProfileCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/teacher_profile.py",
-        database_name=os.environ.get("DB_NAME")
-    )
+    db_manager = db_manager
 
     @classmethod
-    def get_teacher_profile_by_user_id(cls, user_id: str):
+    @readonly
+    def get_teacher_profile_by_user_id(cls, session, user_id: str):
         """Get teacher profile by user ID"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(TeacherProfile).filter(TeacherProfile.user_id == user_id).first()
-        except SQLAlchemyError as e:
-            logger.error(f"TeacherProfileCRUD get_teacher_profile_by_user_id error: {e}")
-            raise
+        return session.get(TeacherProfile, user_id)
 
     @classmethod
-    def get_teachers_by_subject(cls, subject: str):
-        """Get teachers by subject"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(TeacherProfile).filter(TeacherProfile.subjects.contains([subject])).all()
-        except SQLAlchemyError as e:
-            logger.error(f"TeacherProfileCRUD get_teachers_by_subject error: {e}")
-            raise
+    @readonly
+    def get_teachers_by_subject(cls, session, subject: str, eager: bool = False):
+        """Get teachers by subject as (user_id, subjects, organization, max_advisees) rows, or full objects if eager"""
+        stmt = select(TeacherProfile) if eager else select(*_LIST_COLUMNS)
+        result = session.execute(stmt.where(TeacherProfile.subjects.contains([subject])))
+        return result.scalars().all() if eager else result.all()
 
     @classmethod
-    def create_teacher_profile(cls, profile_data: dict):
+    @transactional
+    def create_teacher_profile(cls, session, profile_data: dict):
         """Create a new teacher profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = TeacherProfile(**profile_data)
-                session.add(profile)
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"TeacherProfileCRUD create_teacher_profile error: {e}")
-            raise
+        profile = TeacherProfile(**profile_data)
+        session.add(profile)
+        return profile
 
     @classmethod
-    def update_teacher_profile(cls, user_id: str, update_data: dict):
+    @transactional
+    def update_teacher_profile(cls, session, user_id: str, update_data: dict):
         """Update teacher profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(TeacherProfile).filter(TeacherProfile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                for key, value in update_data.items():
-                    if hasattr(profile, key):
-                        setattr(profile, key, value)
-                
-                session.commit()
-                return profile
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"TeacherProfileCRUD update_teacher_profile error: {e}")
-            raise
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            profile = session.get(TeacherProfile, user_id)
+            if profile is not None:
+                # Detach before commit so the returned row keeps its loaded values
+                session.expunge(profile)
+            return profile
+        
+        profile = session.execute(
+            update(TeacherProfile).where(TeacherProfile.user_id == user_id).values(**values).returning(TeacherProfile)
+        ).scalar_one_or_none()
+        if profile is None:
+            return None
+        
+        session.expunge(profile)
+        return profile
 
     @classmethod
-    def delete_teacher_profile(cls, user_id: str):
+    @transactional
+    def delete_teacher_profile(cls, session, user_id: str):
         """Delete teacher profile"""
-        try:
-            with cls.db_manager.get_session() as session:
-                profile = session.query(TeacherProfile).filter(TeacherProfile.user_id == user_id).first()
-                if not profile:
-                    return None
-                
-                session.delete(profile)
-                session.commit()
-                return user_id
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"TeacherProfileCRUD delete_teacher_profile error: {e}")
-            raise
+        result = session.execute(delete(TeacherProfile).where(TeacherProfile.user_id == user_id))
+        return user_id if result.rowcount else None
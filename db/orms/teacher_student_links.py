@@ -1,108 +1,129 @@
-import os
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from sqlalchemy import Column, ForeignKey, DateTime, func
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from db.orm_db_manager import DatabaseConnectionManager
+from typing import Optional
+from sqlalchemy import ForeignKey, DateTime, func, select, exists, delete, bindparam
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Mapped, mapped_column, relationship, selectinload
+from db.orms.base import Base
+from db.orms.profiles import Profile
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-Base = declarative_base()
-
 class TeacherStudentLink(Base):
     __tablename__ = "teacher_student_links"
 
-    teacher_user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    student_user_id = Column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    teacher_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    student_user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey('profiles.user_id'), primary_key=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
-    teacher = relationship("Profile", foreign_keys=[teacher_user_id])
-    student = relationship("Profile", foreign_keys=[student_user_id])
+    teacher: Mapped["Profile"] = relationship("Profile", foreign_keys=[teacher_user_id])
+    student: Mapped["Profile"] = relationship("Profile", foreign_keys=[student_user_id])
 
     def __repr__(self):
         return f"<TeacherStudentLink(teacher_user_id={self.teacher_user_id}, student_user_id={self.student_user_id})>"
 
 
+# One SELECT ... IN query per relationship instead of a lazy load per link;
+# a JOIN would repeat the teacher's row for every student
+_PROFILE_SUMMARY_COLUMNS = (Profile.user_id, Profile.first_name, Profile.last_name)
+_LINKED_PROFILES = (
+    selectinload(TeacherStudentLink.teacher).load_only(*_PROFILE_SUMMARY_COLUMNS),
+    selectinload(TeacherStudentLink.student).load_only(*_PROFILE_SUMMARY_COLUMNS),
+)
+
+# Built once at import; each call only binds parameters
+_LINK_EXISTS = select(exists().where(
+    TeacherStudentLink.teacher_user_id == bindparam("teacher_user_id"),
+    TeacherStudentLink.student_user_id == bindparam("student_user_id")
+))
+
+
 class TeacherStudentLinkCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/teacher_student_links.py",
-        database_name=os.environ.get("DB_NAME")
-    )
+    db_manager = db_manager
 
     @classmethod
-    def get_teacher_links_by_teacher_id(cls, teacher_user_id: str):
-        """Get all teacher links for a teacher"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(TeacherStudentLink).filter(TeacherStudentLink.teacher_user_id == teacher_user_id).all()
-        except SQLAlchemyError as e:
-            logger.error(f"TeacherStudentLinkCRUD get_teacher_links_by_teacher_id error: {e}")
-            raise
+    @readonly
+    def get_teacher_links_by_teacher_id(cls, session, teacher_user_id: str, load_profiles: bool = False):
+        """Get all teacher links for a teacher, optionally with both profiles eager-loaded"""
+        stmt = select(TeacherStudentLink).where(TeacherStudentLink.teacher_user_id == teacher_user_id)
+        if load_profiles:
+            stmt = stmt.options(*_LINKED_PROFILES)
+        return session.scalars(stmt).all()
 
     @classmethod
-    def get_teacher_links_by_student_id(cls, student_user_id: str):
-        """Get all teacher links for a student"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(TeacherStudentLink).filter(TeacherStudentLink.student_user_id == student_user_id).all()
-        except SQLAlchemyError as e:
-            logger.error(f"TeacherStudentLinkCRUD get_teacher_links_by_student_id error: {e}")
-            raise
+    @readonly
+    def get_teacher_links_by_student_id(cls, session, student_user_id: str, load_profiles: bool = False):
+        """Get all teacher links for a student, optionally with both profiles eager-loaded"""
+        stmt = select(TeacherStudentLink).where(TeacherStudentLink.student_user_id == student_user_id)
+        if load_profiles:
+            stmt = stmt.options(*_LINKED_PROFILES)
+        return session.scalars(stmt).all()
 
     @classmethod
-    def create_teacher_link(cls, teacher_user_id: str, student_user_id: str):
+    @transactional
+    def create_teacher_link(cls, session, teacher_user_id: str, student_user_id: str):
         """Create a new teacher link"""
-        try:
-            with cls.db_manager.get_session() as session:
-                teacher_link = TeacherStudentLink(
-                    teacher_user_id=teacher_user_id,
-                    student_user_id=student_user_id
-                )
-                session.add(teacher_link)
-                session.commit()
-                return teacher_link
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"TeacherStudentLinkCRUD create_teacher_link error: {e}")
-            raise
+        teacher_link = TeacherStudentLink(
+            teacher_user_id=teacher_user_id,
+            student_user_id=student_user_id
+        )
+        session.add(teacher_link)
+        return teacher_link
+
+    @classmethod
+    @transactional
+    def bulk_create_teacher_links(cls, session, pairs, skip_existing: bool = True):
+        """Create teacher links from (teacher_user_id, student_user_id) pairs in one transaction"""
+        mappings = [
+            {"teacher_user_id": teacher_user_id, "student_user_id": student_user_id}
+            for teacher_user_id, student_user_id in pairs
+        ]
+        if not mappings:
+            return 0
+        
+        stmt = pg_insert(TeacherStudentLink.__table__)
+        if skip_existing:
+            stmt = stmt.on_conflict_do_nothing()
+        
+        return session.execute(stmt, mappings).rowcount
+
+    @classmethod
+    @transactional
+    def delete_teacher_link(cls, session, teacher_user_id: str, student_user_id: str):
+        """Delete teacher link in a single DELETE ... RETURNING round-trip"""
+        teacher_link = session.execute(
+            delete(TeacherStudentLink)
+            .where(
+                TeacherStudentLink.teacher_user_id == teacher_user_id,
+                TeacherStudentLink.student_user_id == student_user_id
+            )
+            .returning(TeacherStudentLink)
+        ).scalar_one_or_none()
+        
+        if teacher_link is None:
+            return None
+        
+        # Detach before commit so the returned row keeps its loaded values
+        session.expunge(teacher_link)
+        return teacher_link
 
     @classmethod
-    def delete_teacher_link(cls, teacher_user_id: str, student_user_id: str):
-        """Delete teacher link"""
-        try:
-            with cls.db_manager.get_session() as session:
-                teacher_link = session.query(TeacherStudentLink).filter(
-                    TeacherStudentLink.teacher_user_id == teacher_user_id,
-                    TeacherStudentLink.student_user_id == student_user_id
-                ).first()
-                
-                if not teacher_link:
-                    return None
-                
-                session.delete(teacher_link)
-                session.commit()
-                return teacher_link
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"TeacherStudentLinkCRUD delete_teacher_link error: {e}")
-            raise
+    @transactional
+    def delete_teacher_links_for_teacher(cls, session, teacher_user_id: str):
+        """Remove every student link for a teacher in one DELETE; returns the number removed"""
+        result = session.execute(
+            delete(TeacherStudentLink).where(TeacherStudentLink.teacher_user_id == teacher_user_id)
+        )
+        return result.rowcount
 
     @classmethod
-    def check_teacher_link_exists(cls, teacher_user_id: str, student_user_id: str):
+    @readonly
+    def check_teacher_link_exists(cls, session, teacher_user_id: str, student_user_id: str):
         """Check if teacher link exists"""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(TeacherStudentLink).filter(
-                    TeacherStudentLink.teacher_user_id == teacher_user_id,
-                    TeacherStudentLink.student_user_id == student_user_id
-                ).first() is not None
-        except SQLAlchemyError as e:
-            logger.error(f"TeacherStudentLinkCRUD check_teacher_link_exists error: {e}")
-            raise
+        return bool(session.scalar(
+            _LINK_EXISTS,
+            {"teacher_user_id": teacher_user_id, "student_user_id": student_user_id}
+        ))
@@ -1,75 +1,281 @@
-import os
+import re
 import uuid
 from datetime import datetime
+from functools import wraps
+from threading import Lock
 from typing import List, Optional, Dict, Any
-from sqlalchemy import Column, String, Text, DateTime, func
-from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY
+from cachetools import TTLCache, cached
+from sqlalchemy import Computed, event, LargeBinary, String, Text, DateTime, and_, func, select, text, update, delete
+from sqlalchemy.dialects.postgresql import UUID, JSONB, ARRAY, TSVECTOR, insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
-from db.orm_db_manager import DatabaseConnectionManager
+from sqlalchemy.orm import Mapped, mapped_column
+from db.orms.base import Base
+from db.db_session import db_manager, transactional, readonly
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-Base = declarative_base()
+def _like_pattern(term):
+    """Build a substring LIKE pattern, escaping the term's own wildcards"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+# Planner row estimate for the unfiltered listing total, refreshed at most once a minute
+_row_estimate_cache = TTLCache(maxsize=1, ttl=60)
+_row_estimate_lock = Lock()
+
+# Full-table reads change only when this module writes, so they are cached
+# per process and dropped on every successful write
+_universities_cache = TTLCache(maxsize=4, ttl=60)
+_universities_cache_lock = Lock()
+
+# Callbacks run after every write, so caches kept above the CRUD layer can
+# be dropped without this module importing them
+_write_listeners = []
+
+def on_universities_write(listener):
+    """Register a no-argument callback to run after each successful write to universities"""
+    _write_listeners.append(listener)
+    return listener
+
+def _universities_written():
+    """Drop the cached full-table reads and run the write listeners"""
+    with _universities_cache_lock:
+        _universities_cache.clear()
+    for listener in _write_listeners:
+        listener()
+
+def _after_commit(session):
+    if session.info.pop("universities_written", False):
+        _universities_written()
+
+def _after_soft_rollback(session, previous_transaction):
+    # Only the outermost rollback discards the writes; a savepoint
+    # rollback leaves earlier ones to be committed
+    if previous_transaction.parent is None:
+        session.info.pop("universities_written", None)
+
+def _clears_universities_cache(fn):
+    """
+    Drop the cached full-table reads and run the write listeners once the
+    wrapped write has committed. When the caller passes session=, it owns
+    the commit, so they run from that session's after_commit event instead
+    (and not at all if it rolls back); otherwise a concurrent read could
+    refill the caches with pre-commit data.
+    """
+    @wraps(fn)
+    def wrapper(*args, session=None, **kwargs):
+        if session is None:
+            result = fn(*args, **kwargs)
+            _universities_written()
+            return result
+        
+        result = fn(*args, session=session, **kwargs)
+        if not session.info.get("universities_listening"):
+            session.info["universities_listening"] = True
+            event.listen(session, "after_commit", _after_commit)
+            event.listen(session, "after_soft_rollback", _after_soft_rollback)
+        session.info["universities_written"] = True
+        return result
+    return wrapper
+
+@cached(_row_estimate_cache, key=lambda session: "universities", lock=_row_estimate_lock)
+def _estimated_university_count(session):
+    """Return pg_class.reltuples for universities, or None if the table was never analyzed"""
+    estimate = session.execute(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'public.universities'::regclass")
+    ).scalar()
+    return estimate if estimate and estimate > 0 else None
 
 class University(Base):
     __tablename__ = "universities"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name = Column(Text, nullable=False)
-    country_code = Column(String(2), nullable=False)
-    state_province = Column(Text, nullable=True)
-    city = Column(Text, nullable=True)
-    website = Column(Text, nullable=True)
-    domain = Column(String, unique=True, nullable=True)
-    aliases = Column(ARRAY(String), default=[])
-    external_ids = Column(JSONB, default={})
-    apply_portals = Column(JSONB, default=[])
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Generated by PostgreSQL (uuid_generate_v7 in initializeDatabase.sql)
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, server_default=text("uuid_generate_v7()"))
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+    country_code: Mapped[str] = mapped_column(String(2), nullable=False)
+    state_province: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    city: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    website: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    domain: Mapped[Optional[str]] = mapped_column(String, unique=True, nullable=True)
+    aliases: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String), default=[])
+    external_ids: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, default={})
+    apply_portals: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(JSONB, default=[])
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Bumped on every UPDATE (upserts included) by the update_universities_updated_at trigger
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    # Maintained by PostgreSQL; deferred so entity loads never ship it
+    name_tsv: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', coalesce(name, ''))", persisted=True),
+        deferred=True
+    )
+    # Set by the HIPO sync; bulk_upsert leaves rows alone while it matches
+    content_hash: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
 
     def __repr__(self):
         return f"<University(id={self.id}, name='{self.name}', country_code='{self.country_code}')>"
 
 
-class UniversityCRUD:
-    db_manager = DatabaseConnectionManager(
-        app_name="db/ORMs/university.py",
-        database_name=os.environ.get("DB_NAME")
+# Columns update_university may write; anything else in update_data is ignored
+_UPDATABLE_COLUMNS = frozenset(University.__table__.columns.keys()) - {"name_tsv"}
+
+# Columns an upsert may overwrite on an existing row; the conflict key and
+# creation metadata are left as they are
+_UPSERT_UPDATABLE_COLUMNS = frozenset(
+    column.name for column in University.__table__.columns
+    if column.name not in ("id", "domain", "created_at", "updated_at", "name_tsv")
+)
+
+# Columns returned by the list reads unless eager; leaves out
+# the aliases and JSONB blobs, which can run to kilobytes per row
+_LIST_COLUMNS = (
+    University.id,
+    University.name,
+    University.country_code,
+    University.state_province,
+    University.city,
+    University.website,
+    University.domain,
+)
+
+# Columns returned by search_university_suggestions
+_SUGGESTION_COLUMNS = (University.id, University.name, University.country_code, University.domain)
+
+# Letters and digits only, so no tsquery operator in user input reaches to_tsquery
+_SEARCH_TOKEN = re.compile(r"[^\W_]+")
+
+def _prefix_tsquery(search_term):
+    """
+    to_tsquery text requiring every word of the term, the last one as a
+    prefix, so a partly typed final word still matches ("University of Cal"
+    -> "University & of & Cal:*"). None when the term has no words.
+    """
+    tokens = _SEARCH_TOKEN.findall(search_term)
+    if not tokens:
+        return None
+    return " & ".join(tokens) + ":*"
+
+def _name_matches(search_term):
+    """
+    Name filter for a search term. Multi-word terms go through full-text
+    search on name_tsv (GIN-indexed), so words match in any order and the
+    last word may be incomplete; single words keep substring ILIKE, served
+    by the pg_trgm index.
+    """
+    if len(search_term.split()) > 1:
+        tsquery = _prefix_tsquery(search_term)
+        if tsquery:
+            return University.name_tsv.op("@@")(func.to_tsquery("simple", tsquery))
+    return University.name.ilike(_like_pattern(search_term), escape="\\")
+
+def _search_statement(stmt, search_term, country_code, limit):
+    """Apply the name search, ranking and country filter shared by the search methods"""
+    if search_term:
+        stmt = stmt.where(
+            _name_matches(search_term)
+        ).order_by(func.similarity(University.name, search_term).desc())
+    
+    if country_code:
+        stmt = stmt.where(University.country_code == country_code)
+    
+    return stmt.limit(limit)
+
+# Sort keys accepted by UniversityCRUD.list_universities
+_SORT_COLUMNS = {
+    "name": func.lower(University.name),
+    "country_code": University.country_code,
+    "created_at": University.created_at,
+}
+
+# Loose index scan over idx_universities_country_code: each step jumps to the
+# next larger code, so the cost scales with the ~200 distinct countries
+# instead of the table size a DISTINCT would scan
+_DISTINCT_COUNTRY_CODES = text("""
+    WITH RECURSIVE codes AS (
+        (SELECT country_code FROM universities ORDER BY country_code LIMIT 1)
+        UNION ALL
+        SELECT (
+            SELECT u.country_code FROM universities u
+            WHERE u.country_code > codes.country_code
+            ORDER BY u.country_code LIMIT 1
+        )
+        FROM codes
+        WHERE codes.country_code IS NOT NULL
     )
+    SELECT country_code FROM codes WHERE country_code IS NOT NULL
+""")
+
+
+class UniversityCRUD:
+    db_manager = db_manager
 
     @classmethod
-    def get_all_universities(cls):
-        """Get all universities with basic filtering."""
+    def get_all_universities(cls, eager=False, session=None):
+        """
+        Get all named universities as a list.
+        
+        Kept for callers that want the whole table at once; built on
+        iter_all_universities, so rows still arrive in batches. Returns Row
+        tuples of the _LIST_COLUMNS fields by default; pass eager=True for
+        full University objects. Results are cached per process until the
+        next write, except when read inside a caller's session, which may
+        hold uncommitted changes.
+        """
+        if session is not None:
+            return list(cls.iter_all_universities(eager=eager, session=session))
+        
+        key = ("all", eager)
+        with _universities_cache_lock:
+            universities = _universities_cache.get(key)
+        if universities is None:
+            universities = list(cls.iter_all_universities(eager=eager))
+            with _universities_cache_lock:
+                _universities_cache[key] = universities
+        return universities
+
+    @classmethod
+    def iter_all_universities(cls, batch_size=1000, eager=False, session=None):
+        """
+        Stream all named universities through a server-side cursor.
+        Rows are fetched `batch_size` at a time; prefer this over
+        get_all_universities when the caller only needs one pass.
+        Like get_all_universities, yields _LIST_COLUMNS rows unless eager.
+        """
+        stmt = (
+            (select(University) if eager else select(*_LIST_COLUMNS))
+            .where(University.name.isnot(None), University.name != "")
+            .execution_options(yield_per=batch_size)
+        )
+        if session is not None:
+            result = session.execute(stmt)
+            yield from (result.scalars() if eager else result)
+            return
         try:
             with cls.db_manager.get_session() as session:
-                return session.query(University).filter(
-                    University.name.isnot(None),
-                    University.name != ""
-                ).all()
+                result = session.execute(stmt)
+                yield from (result.scalars() if eager else result)
         except SQLAlchemyError as e:
-            logger.error(f"UniversityCRUD get_all_universities error: {e}")
+            logger.error("UniversityCRUD iter_all_universities error: %s", e)
             raise
 
     @classmethod
-    def get_university_by_id(cls, university_id):
+    @readonly
+    def get_university_by_id(cls, session, university_id):
         """Get a university by ID."""
-        try:
-            with cls.db_manager.get_session() as session:
-                return session.query(University).filter(University.id == university_id).first()
-        except SQLAlchemyError as e:
-            logger.error(f"UniversityCRUD get_university_by_id error: {e}")
-            raise
+        return session.get(University, university_id)
 
     @classmethod
-    def search_universities(cls, search_term, country_code=None, limit=20):
+    @readonly
+    def search_universities(cls, session, search_term, country_code=None, limit=20):
         """
         Search universities by name with optional country filter.
         
+        Single words match with ILIKE on the raw name column so PostgreSQL can
+        serve it from the pg_trgm GIN index (gin_universities_name_trgm);
+        multi-word terms use full-text search on name_tsv. Results are ranked
+        by trigram similarity to the search term.
+        
         Args:
             search_term (str): Search term for university name
             country_code (str): Optional country filter
@@ -78,120 +284,320 @@ class UniversityCRUD:
         Returns:
             List[University]: List of matching universities
         """
-        try:
-            with cls.db_manager.get_session() as session:
-                query = session.query(University).filter(
-                    func.lower(University.name).contains(func.lower(search_term))
-                )
-                
-                if country_code:
-                    query = query.filter(University.country_code == country_code)
-                
-                return query.limit(limit).all()
-        except SQLAlchemyError as e:
-            logger.error(f"UniversityCRUD search_universities error: {e}")
-            raise
+        stmt = _search_statement(select(University), search_term, country_code, limit)
+        return session.scalars(stmt).all()
+
+    @classmethod
+    @readonly
+    def search_university_suggestions(cls, session, search_term, country_code=None, limit=10):
+        """
+        Same matching and ranking as search_universities, but selects only
+        the autocomplete columns and returns (id, name, country_code, domain)
+        Row tuples instead of University objects.
+        """
+        stmt = _search_statement(select(*_SUGGESTION_COLUMNS), search_term, country_code, limit)
+        return session.execute(stmt).all()
+
+    @classmethod
+    @readonly
+    def list_universities(
+        cls,
+        session,
+        search_term=None,
+        country_code=None,
+        sort_by="name",
+        sort_order="asc",
+        limit=20,
+        offset=0
+    ):
+        """
+        Fetch one page of universities with filtering, sorting and paging in SQL.
+        
+        Unfiltered listings report the planner's row estimate as the total,
+        so no COUNT(*) runs at all; filtered listings get an exact total from
+        COUNT(*) OVER() on the page query itself.
+        
+        Args:
+            search_term (str): Optional substring of the university name
+            country_code (str): Optional country filter
+            sort_by (str): name, country_code or created_at
+            sort_order (str): asc or desc
+            limit (int): Page size
+            offset (int): Number of rows to skip
+            
+        Returns:
+            Tuple[List[University], int, bool]: page rows, total, and whether
+            the total is an estimate
+        """
+        filters = [University.name != ""]
+        if search_term:
+            filters.append(_name_matches(search_term))
+        if country_code:
+            filters.append(University.country_code == country_code)
+        
+        estimate = None
+        if not (search_term or country_code):
+            estimate = _estimated_university_count(session)
+        
+        stmt = select(University).where(*filters)
+        if estimate is None:
+            stmt = stmt.add_columns(func.count().over().label("total"))
+        
+        sort_column = _SORT_COLUMNS.get(sort_by)
+        if sort_column is not None:
+            sort_column = sort_column.desc() if sort_order == "desc" else sort_column.asc()
+            stmt = stmt.order_by(sort_column, University.id)
+        
+        rows = session.execute(stmt.offset(offset).limit(limit)).all()
+        universities = [row[0] for row in rows]
+        
+        if estimate is not None:
+            return universities, estimate, True
+        if rows:
+            return universities, rows[0].total, False
+        if offset:
+            # Past the last page: the window count has no row to ride on
+            total = session.scalar(select(func.count()).select_from(University).where(*filters))
+            return universities, total, False
+        return universities, 0, False
 
     @classmethod
-    def get_universities_by_country(cls, country_code):
-        """Get all universities in a specific country."""
+    @readonly
+    def get_universities_by_country(cls, session, country_code, eager=False):
+        """
+        Get all universities in a specific country.
+        
+        Returns Row tuples of the _LIST_COLUMNS fields by default; pass
+        eager=True for full University objects.
+        """
+        stmt = select(University) if eager else select(*_LIST_COLUMNS)
+        result = session.execute(stmt.where(University.country_code == country_code))
+        return result.scalars().all() if eager else result.all()
+
+    @classmethod
+    def iter_universities_by_country(cls, country_code, batch_size=1000):
+        """
+        Stream universities in a country through a server-side cursor.
+        Rows are fetched `batch_size` at a time, so memory stays bounded
+        regardless of how many universities the country has.
+        """
         try:
             with cls.db_manager.get_session() as session:
-                return session.query(University).filter(University.country_code == country_code).all()
+                stmt = (
+                    select(University)
+                    .where(University.country_code == country_code)
+                    .execution_options(yield_per=batch_size)
+                )
+                yield from session.scalars(stmt)
         except SQLAlchemyError as e:
-            logger.error(f"UniversityCRUD get_universities_by_country error: {e}")
+            logger.error("UniversityCRUD iter_universities_by_country error: %s", e)
             raise
 
     @classmethod
-    def create_or_update_university(cls, university_data):
+    @_clears_universities_cache
+    @transactional
+    def create_or_update_university(cls, session, university_data):
         """
         Create a new university or update existing one.
         This is the main method for upsert operations.
+        
+        Runs as a single INSERT ... ON CONFLICT DO UPDATE, so the database
+        resolves concurrent writers atomically. Rows are matched on domain,
+        or on (lower(name), country_code) for universities without a domain.
         """
-        try:
-            with cls.db_manager.get_session() as session:
-                domain = university_data.get('domain')
-                
-                if domain:
-                    # Try to find by domain first
-                    existing = session.query(University).filter(University.domain == domain).first()
-                else:
-                    # Fallback to name + country_code
-                    name = university_data.get('name')
-                    country_code = university_data.get('country_code')
-                    if name and country_code:
-                        existing = session.query(University).filter(
-                            func.lower(University.name) == func.lower(name),
-                            University.country_code == country_code
-                        ).first()
-                    else:
-                        existing = None
-
-                if existing:
-                    # Update existing record
-                    for key, value in university_data.items():
-                        if hasattr(existing, key):
-                            setattr(existing, key, value)
-                    existing.updated_at = datetime.utcnow()
-                    session.commit()
-                    return existing
+        stmt = pg_insert(University).values(**university_data)
+        
+        # Only overwrite the columns the caller supplied
+        update_columns = {
+            key: stmt.excluded[key]
+            for key in university_data
+            if key in _UPSERT_UPDATABLE_COLUMNS
+        }
+        
+        if university_data.get('domain'):
+            conflict = {"index_elements": [University.domain]}
+            existing = (University.domain == university_data['domain'],)
+        elif university_data.get('name') and university_data.get('country_code'):
+            conflict = {
+                "index_elements": [func.lower(University.name), University.country_code],
+                "index_where": University.domain.is_(None),
+            }
+            existing = (
+                func.lower(University.name) == university_data['name'].lower(),
+                University.country_code == university_data['country_code'],
+                University.domain.is_(None),
+            )
+        else:
+            conflict = None
+        
+        if conflict is not None:
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(set_=update_columns, **conflict)
+            else:
+                # Nothing to overwrite, and DO UPDATE needs at least one column
+                stmt = stmt.on_conflict_do_nothing(**conflict)
+        
+        university = session.execute(stmt.returning(University)).scalar_one_or_none()
+        if university is None:
+            # DO NOTHING returns no row on conflict; read the existing one
+            university = session.scalars(select(University).where(*existing)).one()
+        session.expunge(university)
+        return university
+
+    @classmethod
+    @_clears_universities_cache
+    @transactional
+    def bulk_add_universities(cls, session, rows, batch_size=1000, skip_existing=True):
+        """
+        Insert many universities in one transaction.
+        
+        Rows are sent `batch_size` at a time as multi-row INSERTs and
+        committed once at the end. Every row must carry the same keys.
+        
+        Args:
+            rows (List[dict]): University column values, one dict per row
+            batch_size (int): Rows per INSERT statement
+            skip_existing (bool): Add ON CONFLICT DO NOTHING so rows that
+                collide with an existing domain are skipped instead of failing
+                the whole batch
+            
+        Returns:
+            int: Number of rows inserted
+        """
+        stmt = pg_insert(University.__table__)
+        if skip_existing:
+            stmt = stmt.on_conflict_do_nothing()
+        
+        inserted = 0
+        for start in range(0, len(rows), batch_size):
+            result = session.execute(stmt, rows[start:start + batch_size])
+            inserted += result.rowcount
+        return inserted
+
+    @classmethod
+    @_clears_universities_cache
+    @transactional
+    def bulk_upsert(cls, session, rows, batch_size=1000):
+        """
+        Create or update many universities in one transaction.
+        
+        The batched form of create_or_update_university: rows with a domain
+        are upserted on domain, the rest on (lower(name), country_code), each
+        as multi-row INSERT ... ON CONFLICT DO UPDATE statements of up to
+        `batch_size` rows. Every row must carry the same keys. Rows that
+        carry a content_hash only update an existing row whose stored hash
+        differs, so unchanged rows are neither rewritten nor counted.
+        
+        Args:
+            rows (List[dict]): University column values, one dict per row
+            batch_size (int): Rows per INSERT statement
+            
+        Returns:
+            int: Number of rows inserted or updated
+        """
+        # ON CONFLICT DO UPDATE cannot touch the same row twice in one
+        # statement, so collapse duplicate keys up front (last one wins)
+        with_domain = {}
+        without_domain = {}
+        for row in rows:
+            if row.get('domain'):
+                with_domain[row['domain'].lower()] = row
+            elif row.get('name') and row.get('country_code'):
+                without_domain[(row['name'].lower(), row['country_code'])] = row
+        
+        upserted = 0
+        for batch_rows, conflict in (
+            (list(with_domain.values()), {"index_elements": [University.domain]}),
+            (list(without_domain.values()), {
+                "index_elements": [func.lower(University.name), University.country_code],
+                "index_where": University.domain.is_(None),
+            }),
+        ):
+            for start in range(0, len(batch_rows), batch_size):
+                batch = batch_rows[start:start + batch_size]
+                stmt = pg_insert(University.__table__).values(batch)
+                update_columns = {
+                    key: stmt.excluded[key]
+                    for key in batch[0]
+                    if key in _UPSERT_UPDATABLE_COLUMNS
+                }
+                if not update_columns:
+                    stmt = stmt.on_conflict_do_nothing(**conflict)
+                elif "content_hash" in batch[0]:
+                    stmt = stmt.on_conflict_do_update(
+                        set_=update_columns,
+                        where=University.content_hash.is_distinct_from(stmt.excluded.content_hash),
+                        **conflict
+                    )
                 else:
-                    # Create new record
-                    new_university = University(**university_data)
-                    session.add(new_university)
-                    session.commit()
-                    return new_university
-                    
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"UniversityCRUD create_or_update_university error: {e}")
-            raise
+                    stmt = stmt.on_conflict_do_update(set_=update_columns, **conflict)
+                upserted += session.execute(stmt).rowcount
+        return upserted
 
     @classmethod
-    def update_university(cls, university_id, update_data):
+    @_clears_universities_cache
+    @transactional
+    def update_university(cls, session, university_id, update_data):
         """Update a university's details."""
-        try:
-            with cls.db_manager.get_session() as session:
-                university = session.query(University).filter(University.id == university_id).first()
-                if not university:
-                    return None
-                
-                for key, value in update_data.items():
-                    if hasattr(university, key):
-                        setattr(university, key, value)
-                
-                university.updated_at = datetime.utcnow()
-                session.commit()
-                return university
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"UniversityCRUD update_university error: {e}")
-            raise
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            university = session.get(University, university_id)
+            if university is not None:
+                # Detach before commit so the returned row keeps its loaded values
+                session.expunge(university)
+            return university
+        
+        # updated_at is filled in by the update_universities_updated_at trigger
+        university = session.execute(
+            update(University).where(University.id == university_id).values(**values).returning(University)
+        ).scalar_one_or_none()
+        if university is None:
+            return None
+        
+        session.expunge(university)
+        return university
+
+    @classmethod
+    @_clears_universities_cache
+    @transactional
+    def update_university_shallow(cls, session, university_id, update_data):
+        """Update a university's details without reading the row back; returns the number of rows updated"""
+        values = {k: v for k, v in update_data.items() if k in _UPDATABLE_COLUMNS}
+        if not values:
+            return 0
+        
+        return session.execute(
+            update(University).where(University.id == university_id).values(**values)
+        ).rowcount
 
     @classmethod
-    def delete_university(cls, university_id):
+    @_clears_universities_cache
+    @transactional
+    def delete_university(cls, session, university_id):
         """Delete a university by ID."""
-        try:
-            with cls.db_manager.get_session() as session:
-                university = session.query(University).filter(University.id == university_id).first()
-                if not university:
-                    return None
-                
-                session.delete(university)
-                session.commit()
-                return university_id
-        except SQLAlchemyError as e:
-            session.rollback()
-            logger.error(f"UniversityCRUD delete_university error: {e}")
-            raise
+        result = session.execute(delete(University).where(University.id == university_id))
+        return university_id if result.rowcount else None
 
     @classmethod
-    def get_countries_with_universities(cls):
+    @readonly
+    def get_statistics(cls, session):
+        """
+        Count universities in one aggregate query.
+        
+        Returns:
+            dict: total_universities, total_countries, with_website and
+                with_domain; the university counts cover named rows only
+        """
+        named = and_(University.name.isnot(None), University.name != "")
+        return session.execute(select(
+            func.count().filter(named).label("total_universities"),
+            func.count(University.country_code.distinct()).label("total_countries"),
+            func.count().filter(named, University.website != "").label("with_website"),
+            func.count().filter(named, University.domain != "").label("with_domain"),
+        )).one()._asdict()
+
+    @classmethod
+    @readonly
+    def get_countries_with_universities(cls, session):
         """Get list of countries that have universities."""
-        try:
-            with cls.db_manager.get_session() as session:
-                countries = session.query(University.country_code).distinct().all()
-                return [country[0] for country in countries]
-        except SQLAlchemyError as e:
-            logger.error(f"UniversityCRUD get_countries_with_universities error: {e}")
-            raise
+        return session.scalars(_DISTINCT_COUNTRY_CODES).all()
@@ -1,11 +1,23 @@
+import logging
+
+# Configure logging once for the whole app, before any module logs at import
+# time; library modules only create loggers
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.v1.auth_route import router as auth_router
+from api.v1.universities_route import router as universities_router
+from core.responses import ORJSONResponse
 
 app = FastAPI(
     title="Uni Tracker Backend",
     description="Unified Tracker Backend API",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -19,6 +31,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(auth_router)
+app.include_router(universities_router)
 
 @app.get("/")
 async def root():
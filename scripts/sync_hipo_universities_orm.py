@@ -1,5 +1,7 @@
 import argparse
 import asyncio
+import hashlib
+import logging
 import os
 import sys
 from typing import List, Optional
@@ -8,10 +10,10 @@ from typing import List, Optional
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import httpx
-from dotenv import load_dotenv
+import orjson
 
 # Import our ORM models
-from db.orms import University, Base, UniversityCRUD
+from db.orms import UniversityCRUD
 
 HIPOLABS_URL = "http://universities.hipolabs.com/search"
 
@@ -40,7 +42,7 @@ def normalize(item: dict) -> dict:
     website = first_or_none(item.get("web_pages")) or None
     domain = first_or_none(item.get("domains")) or None
 
-    return {
+    data = {
         "name": name,
         "country_code": cc,
         "state_province": state,
@@ -51,34 +53,125 @@ def normalize(item: dict) -> dict:
         "external_ids": {},           # Leave empty, can be filled later with OpenAlex/ROR
         "apply_portals": [],          # Leave empty for now
     }
+    # Lets re-syncs skip rows whose source data hasn't changed
+    data["content_hash"] = hashlib.blake2b(
+        orjson.dumps(data, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).digest()
+    return data
 
-async def fetch_country(country: str) -> list:
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.get(HIPOLABS_URL, params={"country": country})
+# Cap concurrent requests so we don't hammer the Hipo API
+MAX_CONCURRENT_FETCHES = 10
+
+# ETags from the last successful sync, keyed by country; lets unchanged
+# countries come back as 304 Not Modified and skip the upsert entirely.
+# Each entry is {"etag": ..., "country_code": ...} and is only sent while
+# the database still holds universities for that code, so a reset or
+# restored database gets a full download instead of a run of 304s
+ETAG_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "hipo_etags.json")
+
+def load_etags(path: str) -> dict:
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+
+def save_etags(path: str, etags: dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(etags, option=orjson.OPT_SORT_KEYS))
+
+async def fetch_country(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, country: str, etag: Optional[str] = None) -> tuple:
+    """Returns (items, etag); items is None when Hipo reports the country unchanged"""
+    headers = {"If-None-Match": etag} if etag else {}
+    async with semaphore:
+        r = await client.get(HIPOLABS_URL, params={"country": country}, headers=headers)
+        if r.status_code == 304:
+            return None, etag
         r.raise_for_status()
-        return r.json()
+        return orjson.loads(r.content), r.headers.get("ETag")
+
+def upsert_items(items: list) -> int:
+    """Normalize one country's Hipo items and bulk upsert them; returns rows upserted"""
+    rows = []
+    for item in items:
+        data = normalize(item)
+        if not data["name"] or not data["country_code"]:
+            # Skip if missing key fields
+            continue
+        rows.append(data)
+    return UniversityCRUD.bulk_upsert(rows)
+
+def stored_etag(entry, stored_codes: set) -> Optional[str]:
+    """The ETag to send for a country, or None if its rows may be missing from the DB"""
+    if isinstance(entry, dict) and entry.get("country_code") in stored_codes:
+        return entry.get("etag")
+    return None
 
-async def sync_countries_orm(countries: List[str]) -> dict:
-    fetched = upserted = 0
+async def sync_country(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, country: str, etags: dict, stored_codes: set) -> tuple:
+    """Fetch one country and upsert it; returns (fetched, upserted, unchanged)"""
+    items, etag = await fetch_country(client, semaphore, country, stored_etag(etags.get(country), stored_codes))
+    if items is None:
+        print(f"{country}: unchanged since last sync, skipping")
+        return 0, 0, True
+    
+    try:
+        # Normalizing and the DB call are blocking; keep them off the event
+        # loop so other countries keep downloading meanwhile
+        upserted = await asyncio.to_thread(upsert_items, items)
+    except Exception as e:
+        print(f"Error processing {country}: {e}")
+        return len(items), 0, False
+    
+    # Only remember the ETag once bulk_upsert has committed the data
+    country_code = next((normalize(item)["country_code"] for item in items), None)
+    if etag and country_code:
+        etags[country] = {"etag": etag, "country_code": country_code}
+    else:
+        etags.pop(country, None)
+    return len(items), upserted, False
+
+async def sync_countries_orm(countries: List[str], etag_cache: Optional[str] = ETAG_CACHE_PATH) -> dict:
+    # Each distinct, non-empty country is fetched once
+    countries = list(dict.fromkeys(c.strip() for c in countries if c.strip()))
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+    etags = load_etags(etag_cache) if etag_cache else {}
+    # Country codes that actually have rows; stored ETags for any other
+    # country are ignored
+    stored_codes = set(await asyncio.to_thread(UniversityCRUD.get_countries_with_universities)) if etags else set()
+    
+    # One client for every request so connections are reused
+    async with httpx.AsyncClient(
+        timeout=30,
+        limits=httpx.Limits(max_connections=MAX_CONCURRENT_FETCHES)
+    ) as client:
+        # One failing country must not abandon the others mid-request, so
+        # every fetch runs to completion before the client is closed
+        results = await asyncio.gather(
+            *(sync_country(client, semaphore, country, etags, stored_codes) for country in countries),
+            return_exceptions=True
+        )
+    
+    failed = []
+    for country, result in zip(countries, results):
+        if isinstance(result, BaseException):
+            print(f"Error fetching {country}: {result}")
+            failed.append(country)
+    results = [r for r in results if not isinstance(r, BaseException)]
+    
+    # etags only holds entries for countries stored successfully
+    if etag_cache:
+        save_etags(etag_cache, etags)
     
-    for country in countries:
-        items = await fetch_country(country)
-        fetched += len(items)
-        
-        for item in items:
-            data = normalize(item)
-            if not data["name"] or not data["country_code"]:
-                # Skip if missing key fields
-                continue
-            
-            try:
-                UniversityCRUD.create_or_update_university(data)
-                upserted += 1
-            except Exception as e:
-                print(f"Error processing {data['name']}: {e}")
-                continue
+    if results and all(unchanged for _, _, unchanged in results):
+        print(
+            "Warning: every country came back unchanged (304), so nothing was written. "
+            "If the database should have changed, re-run with --refresh."
+        )
     
-    return {"countries": len(countries), "fetched": fetched, "upserted": upserted}
+    fetched = sum(f for f, _, _ in results)
+    upserted = sum(u for _, u, _ in results)
+    return {"countries": len(countries), "fetched": fetched, "upserted": upserted, "failed": failed}
 
 # ---------- CLI ----------
 def parse_args():
@@ -87,6 +180,7 @@ def parse_args():
     g.add_argument("--countries", help="Comma separated, e.g. 'Australia,United States'")
     g.add_argument("--countries-file", help="Text file: one country per line")
     g.add_argument("--all", action="store_true", help="Use built-in sample list")
+    p.add_argument("--refresh", action="store_true", help="Ignore stored ETags and re-download every country")
     return p.parse_args()
 
 def read_countries(path: str) -> List[str]:
@@ -94,6 +188,10 @@ def read_countries(path: str) -> List[str]:
         return [ln.strip() for ln in f if ln.strip()]
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     args = parse_args()
     if args.countries:
         countries = [x.strip() for x in args.countries.split(",") if x.strip()]
@@ -105,6 +203,9 @@ def main():
     print("Using ORM for database operations")
     print(f"Will sync {len(countries)} country/countries: {countries}")
     
+    if args.refresh:
+        # Start from an empty cache; fresh ETags are still saved afterwards
+        save_etags(ETAG_CACHE_PATH, {})
     result = asyncio.run(sync_countries_orm(countries))
     print("Sync result:", result)
 
@@ -1,33 +1,169 @@
+import asyncio
+import hashlib
 import os
+import random
+import time
+from functools import lru_cache, wraps
+from threading import Lock
 from typing import Optional, Dict, Any
-from supabase import create_client, Client
+import httpx
+from cachetools import TLRUCache, TTLCache, cached
+from jose import jwt, JWTError
+from gotrue import AsyncGoTrueClient
+from gotrue.helpers import parse_user_response
+from gotrue.types import UserResponse
 from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 import logging
 from dotenv import load_dotenv
 
 # Import ORM models for local database integration
-from db.orms.profiles import ProfileCRUD, Profile
+from db.orms.profiles import ProfileCRUD
 
 # Load environment variables
 load_dotenv()
 
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+# Optional: lets get_current_user verify HS256 access tokens locally;
+# asymmetric (RS256/ES256) tokens are verified against the JWKS
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+
 logger = logging.getLogger(__name__)
 
+# Local role lookups by user id; every authenticated request needs one and
+# roles rarely change, so a short TTL bounds how stale a result can get
+_profile_role_cache = TTLCache(maxsize=10_000, ttl=60)
+_profile_role_lock = Lock()
+
+@cached(_profile_role_cache, key=lambda user_id: str(user_id), lock=_profile_role_lock)
+def _get_profile_role(user_id) -> str:
+    """Role from the local profile, defaulting to "student" when there is none"""
+    return ProfileCRUD.get_profile_role(user_id) or "student"
+
+def _forget_profile_role(user_id):
+    with _profile_role_lock:
+        _profile_role_cache.pop(str(user_id), None)
+
+# Supabase Auth's public signing keys (JWKS), used to verify asymmetrically
+# signed access tokens locally. Refetched every 10 minutes to pick up key
+# rotation; a failed fetch is cached too, so an outage costs one request
+_jwks_cache = TTLCache(maxsize=1, ttl=600)
+
+# Signed-out access tokens -> their exp. JWTs stay valid until they expire,
+# so sign_out records them here and get_current_user rejects them; each entry
+# is dropped once its token would have expired anyway. Keys are digests so
+# raw bearer tokens are never held. Only touched from the event loop.
+# This is a per-worker fast path, not the revocation itself: other workers
+# never see it and a full cache evicts entries early. sign_out always ends
+# the session in Supabase Auth too, which revokes its refresh token.
+_revoked_tokens = TLRUCache(maxsize=100_000, ttu=lambda _key, exp, _now: exp, timer=time.time)
+
+def _revocation_key(access_token: str) -> bytes:
+    return hashlib.blake2b(access_token.encode(), digest_size=16).digest()
+
+# Connection pool for Supabase Auth: enough keep-alive connections that bursts
+# of sign-ins reuse warm TLS sessions instead of handshaking again, and a
+# short connect timeout so an unreachable endpoint fails fast
+SUPABASE_HTTP_LIMITS = httpx.Limits(max_connections=60, max_keepalive_connections=40, keepalive_expiry=60)
+SUPABASE_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
+def _supabase_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        # retries only re-attempts failed connects, never a sent request
+        transport=httpx.AsyncHTTPTransport(limits=SUPABASE_HTTP_LIMITS, retries=3),
+        timeout=SUPABASE_HTTP_TIMEOUT
+    )
+
+# Failures raised before the request left this process. Only these are safe
+# to retry for every call: refresh_session rotates the refresh token, so
+# replaying a request the server may have seen would send a revoked token
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+def _is_connect_failure(exc: BaseException) -> bool:
+    """
+    Whether exc is, or was raised while handling, a connect-phase httpx error.
+    gotrue wraps every non-HTTP-status error (parse failures included) in
+    AuthRetryableError without chaining it explicitly, so the cause is found
+    by walking __cause__/__context__.
+    """
+    while exc is not None:
+        if isinstance(exc, _CONNECT_ERRORS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+async def _retry(call, *, max_retries: int = 2, base: float = 0.1, cap: float = 1.0):
+    """
+    Await call(), retrying connect failures with exponential backoff and jitter.
+    Anything that may have reached Supabase Auth (read timeouts, 5xx, bad
+    credentials, malformed responses) propagates immediately, so every call,
+    refresh_session included, is at most sent once.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if attempt == max_retries or not _is_connect_failure(e):
+                raise
+            delay = min(cap, base * 2 ** attempt) + random.uniform(0, 0.1)
+            logger.warning("Could not connect to Supabase Auth, retrying in %.2fs: %s", delay, e)
+            await asyncio.sleep(delay)
+
+def _auth_errors(label: str, status_code: int, detail: Optional[str] = None):
+    """
+    Turn unexpected errors from an AuthService method into an HTTPException.
+    HTTPExceptions raised by the method pass through unchanged; anything else
+    is logged as "<label> error" and reported with status_code and detail
+    (the exception text when detail is None).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await fn(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error("%s error: %s", label, e)
+                raise HTTPException(
+                    status_code=status_code,
+                    detail=str(e) if detail is None else detail
+                )
+        return wrapper
+    return decorator
+
 class AuthService:
     """Supabase authentication service with local database integration"""
     
     def __init__(self):
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_ANON_KEY")
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_ANON_KEY
+        self.jwt_secret = SUPABASE_JWT_SECRET
         
-        # Initialize Supabase client only if credentials are available
+        # Initialize Supabase Auth client only if credentials are available.
+        # supabase-py 2.0 has no async client, so talk to Supabase Auth through
+        # the async GoTrue client it wraps; every call is awaited instead of
+        # blocking the event loop
         if self.supabase_url and self.supabase_key:
-            self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+            self._http_client = _supabase_http_client()
+            self.auth = AsyncGoTrueClient(
+                url=f"{self.supabase_url}/auth/v1",
+                headers={
+                    "apiKey": self.supabase_key,
+                    "Authorization": f"Bearer {self.supabase_key}"
+                },
+                auto_refresh_token=False,
+                persist_session=False,
+                http_client=self._http_client
+            )
             self._initialized = True
         else:
             logger.warning("SUPABASE_URL and SUPABASE_ANON_KEY not set. Authentication features will be disabled.")
-            self.supabase = None
+            self._http_client = None
+            self.auth = None
             self._initialized = False
+
     
     def _check_initialization(self):
         """Check if the service is properly initialized"""
@@ -37,307 +173,363 @@ class AuthService:
                 detail="Authentication service not configured. Please set SUPABASE_URL and SUPABASE_ANON_KEY environment variables."
             )
     
+    async def _update_user(self, access_token: str, attributes: Dict[str, Any]) -> UserResponse:
+        """
+        Update the token owner's Supabase user with PUT /auth/v1/user.
+        The token goes in the request itself, so concurrent requests never
+        share session state the way set_session + update_user on the shared
+        client would.
+        """
+        r = await self._http_client.put(
+            f"{self.supabase_url}/auth/v1/user",
+            headers={"apiKey": self.supabase_key, "Authorization": f"Bearer {access_token}"},
+            json=attributes
+        )
+        r.raise_for_status()
+        return parse_user_response(r.json())
+    
+    @_auth_errors("Sign up", status.HTTP_400_BAD_REQUEST)
     async def sign_up(self, email: str, password: str, first_name: Optional[str] = None, last_name: Optional[str] = None, role: str = "student") -> Dict[str, Any]:
         """Register a new user with both Supabase and local database"""
         self._check_initialization()
         
-        try:
-            # Step 1: Create user with Supabase Auth
-            response = self.supabase.auth.sign_up({
-                "email": email,
-                "password": password,
-                "options": {
-                    "data": {
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "role": role
-                    }
+        # Step 1: Create user with Supabase Auth
+        response = await self.auth.sign_up({
+            "email": email,
+            "password": password,
+            "options": {
+                "data": {
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "role": role
                 }
-            })
+            }
+        })
+        
+        if response.user:
+            # Step 2: Create profile in local database
+            profile_data = {
+                "user_id": response.user.id,
+                "role": role,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email
+            }
             
-            if response.user:
-                # Step 2: Create profile in local database
-                profile_data = {
-                    "user_id": response.user.id,
-                    "role": role,
+            try:
+                # Create local user profile
+                await run_in_threadpool(ProfileCRUD.create_profile, profile_data)
+                _forget_profile_role(response.user.id)
+                logger.info("Created local profile for user %s with role %s", response.user.id, role)
+            except Exception as e:
+                logger.error("Failed to create local profile: %s", e)
+                # Continue with Supabase user creation but log the error
+                # In production, you might want to rollback the Supabase user creation
+            
+            return {
+                "user": {
+                    "id": response.user.id,
+                    "email": response.user.email,
                     "first_name": first_name,
                     "last_name": last_name,
-                    "email": email
-                }
-                
-                try:
-                    # Create local user profile
-                    local_profile = ProfileCRUD.create_profile(profile_data)
-                    logger.info(f"Created local profile for user {response.user.id} with role {role}")
-                except Exception as e:
-                    logger.error(f"Failed to create local profile: {e}")
-                    # Continue with Supabase user creation but log the error
-                    # In production, you might want to rollback the Supabase user creation
-                
-                return {
-                    "user": {
-                        "id": response.user.id,
-                        "email": response.user.email,
-                        "first_name": first_name,
-                        "last_name": last_name,
-                        "role": role,
-                        "created_at": str(response.user.created_at) if response.user.created_at else None,
-                        "updated_at": str(response.user.updated_at) if response.user.updated_at else None
-                    },
-                    "access_token": response.session.access_token if response.session else None,
-                    "refresh_token": response.session.refresh_token if response.session else None
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to create user"
-                )
-                
-        except Exception as e:
-            logger.error(f"Sign up error: {e}")
+                    "role": role,
+                    "created_at": str(response.user.created_at) if response.user.created_at else None,
+                    "updated_at": str(response.user.updated_at) if response.user.updated_at else None
+                },
+                "access_token": response.session.access_token if response.session else None,
+                "refresh_token": response.session.refresh_token if response.session else None
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
+                detail="Failed to create user"
             )
     
+    @_auth_errors("Sign in", status.HTTP_401_UNAUTHORIZED, "Invalid credentials")
     async def sign_in(self, email: str, password: str) -> Dict[str, Any]:
         """Sign in user and sync with local database"""
         self._check_initialization()
         
-        try:
-            response = self.supabase.auth.sign_in_with_password({
-                "email": email,
-                "password": password
-            })
+        response = await _retry(lambda: self.auth.sign_in_with_password({
+            "email": email,
+            "password": password
+        }))
+        
+        if response.user and response.session:
+            # Sync user data with local database
+            try:
+                role = await run_in_threadpool(_get_profile_role, response.user.id)
+            except Exception as e:
+                logger.error("Failed to get local profile: %s", e)
+                role = "student"
             
-            if response.user and response.session:
-                # Sync user data with local database
-                try:
-                    local_profile = ProfileCRUD.get_profile_by_user_id(response.user.id)
-                    role = local_profile.role if local_profile else "student"
-                except Exception as e:
-                    logger.error(f"Failed to get local profile: {e}")
-                    role = "student"
-                
-                return {
-                    "user": {
-                        "id": response.user.id,
-                        "email": response.user.email,
-                        "first_name": response.user.user_metadata.get("first_name"),
-                        "last_name": response.user.user_metadata.get("last_name"),
-                        "role": role,
-                        "created_at": str(response.user.created_at) if response.user.created_at else None,
-                        "updated_at": str(response.user.updated_at) if response.user.updated_at else None
-                    },
-                    "access_token": response.session.access_token,
-                    "refresh_token": response.session.refresh_token
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid credentials"
-                )
-                
-        except Exception as e:
-            logger.error(f"Sign in error: {e}")
+            return {
+                "user": {
+                    "id": response.user.id,
+                    "email": response.user.email,
+                    "first_name": response.user.user_metadata.get("first_name"),
+                    "last_name": response.user.user_metadata.get("last_name"),
+                    "role": role,
+                    "created_at": str(response.user.created_at) if response.user.created_at else None,
+                    "updated_at": str(response.user.updated_at) if response.user.updated_at else None
+                },
+                "access_token": response.session.access_token,
+                "refresh_token": response.session.refresh_token
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid credentials"
             )
     
+    async def _logout(self, access_token: str) -> None:
+        """
+        End the token's session with POST /auth/v1/logout, which revokes its
+        refresh token. A 401 means the session is already gone.
+        """
+        r = await self._http_client.post(
+            f"{self.supabase_url}/auth/v1/logout",
+            params={"scope": "local"},
+            headers={"apiKey": self.supabase_key, "Authorization": f"Bearer {access_token}"}
+        )
+        if r.status_code != status.HTTP_401_UNAUTHORIZED:
+            r.raise_for_status()
+    
+    @_auth_errors("Sign out", status.HTTP_400_BAD_REQUEST, "Failed to sign out")
     async def sign_out(self, access_token: str) -> bool:
-        """Sign out user"""
+        """
+        Sign out user: the access token is rejected by this worker at once,
+        and the session is ended in Supabase Auth so it can't be refreshed
+        """
         self._check_initialization()
         
-        try:
-            self.supabase.auth.sign_out()
-            return True
-        except Exception as e:
-            logger.error(f"Sign out error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to sign out"
-            )
+        exp = jwt.get_unverified_claims(access_token).get("exp")
+        if isinstance(exp, (int, float)) and exp > time.time():
+            _revoked_tokens[_revocation_key(access_token)] = exp
+        
+        await _retry(lambda: self._logout(access_token))
+        return True
     
+    def is_token_revoked(self, access_token: str) -> bool:
+        """Whether the access token was signed out before it expired"""
+        return _revocation_key(access_token) in _revoked_tokens
+    
+    @_auth_errors("Refresh token", status.HTTP_401_UNAUTHORIZED, "Invalid refresh token")
     async def refresh_token(self, refresh_token: str) -> Dict[str, Any]:
         """Refresh access token"""
         self._check_initialization()
         
-        try:
-            response = self.supabase.auth.refresh_session(refresh_token)
+        response = await _retry(lambda: self.auth.refresh_session(refresh_token))
+        
+        if response.user and response.session:
+            # Get role from local database
+            try:
+                role = await run_in_threadpool(_get_profile_role, response.user.id)
+            except Exception as e:
+                logger.error("Failed to get local profile: %s", e)
+                role = "student"
             
-            if response.user and response.session:
-                # Get role from local database
-                try:
-                    local_profile = ProfileCRUD.get_profile_by_user_id(response.user.id)
-                    role = local_profile.role if local_profile else "student"
-                except Exception as e:
-                    logger.error(f"Failed to get local profile: {e}")
-                    role = "student"
-                
-                return {
-                    "user": {
-                        "id": response.user.id,
-                        "email": response.user.email,
-                        "first_name": response.user.user_metadata.get("first_name"),
-                        "last_name": response.user.user_metadata.get("last_name"),
-                        "role": role,
-                        "created_at": str(response.user.created_at) if response.user.created_at else None,
-                        "updated_at": str(response.user.updated_at) if response.user.updated_at else None
-                    },
-                    "access_token": response.session.access_token,
-                    "refresh_token": response.session.refresh_token
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid refresh token"
-                )
-                
-        except Exception as e:
-            logger.error(f"Refresh token error: {e}")
+            return {
+                "user": {
+                    "id": response.user.id,
+                    "email": response.user.email,
+                    "first_name": response.user.user_metadata.get("first_name"),
+                    "last_name": response.user.user_metadata.get("last_name"),
+                    "role": role,
+                    "created_at": str(response.user.created_at) if response.user.created_at else None,
+                    "updated_at": str(response.user.updated_at) if response.user.updated_at else None
+                },
+                "access_token": response.session.access_token,
+                "refresh_token": response.session.refresh_token
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid refresh token"
             )
     
+    @_auth_errors("Password reset", status.HTTP_400_BAD_REQUEST, "Failed to send password reset email")
     async def reset_password(self, email: str) -> bool:
         """Send password reset email"""
         self._check_initialization()
         
-        try:
-            self.supabase.auth.reset_password_email(email)
-            return True
-        except Exception as e:
-            logger.error(f"Password reset error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to send password reset email"
-            )
+        await self.auth.reset_password_email(email)
+        return True
     
+    @_auth_errors("Update password", status.HTTP_400_BAD_REQUEST, "Failed to update password")
     async def update_password(self, access_token: str, new_password: str) -> bool:
         """Update user password"""
         self._check_initialization()
         
-        try:
-            # Set the access token for the session
-            self.supabase.auth.set_session(access_token, None)
-            
-            # Update password
-            response = self.supabase.auth.update_user({
-                "password": new_password
-            })
-            
-            return response.user is not None
-            
-        except Exception as e:
-            logger.error(f"Update password error: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to update password"
-            )
+        # Update password
+        response = await self._update_user(access_token, {
+            "password": new_password
+        })
+        
+        return response.user is not None
     
+    @_auth_errors("Update profile", status.HTTP_400_BAD_REQUEST, "Failed to update profile")
     async def update_profile(self, access_token: str, first_name: Optional[str] = None, last_name: Optional[str] = None) -> Dict[str, Any]:
         """Update user profile in both Supabase and local database"""
         self._check_initialization()
         
-        try:
-            # Set the access token for the session
-            self.supabase.auth.set_session(access_token, None)
-            
-            # Get current user
-            user = self.supabase.auth.get_user()
-            if not user.user:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid access token"
-                )
-            
-            # Update user metadata in Supabase
-            user_data = {}
-            if first_name is not None:
-                user_data["first_name"] = first_name
-            if last_name is not None:
-                user_data["last_name"] = last_name
-            
-            response = self.supabase.auth.update_user({
-                "data": user_data
-            })
-            
-            if response.user:
-                # Update local database profile
-                try:
-                    update_data = {}
-                    if first_name is not None:
-                        update_data["first_name"] = first_name
-                    if last_name is not None:
-                        update_data["last_name"] = last_name
-                    
-                    if update_data:
-                        ProfileCRUD.update_profile(response.user.id, update_data)
-                        logger.info(f"Updated local profile for user {response.user.id}")
-                except Exception as e:
-                    logger.error(f"Failed to update local profile: {e}")
-                
-                return {
-                    "id": response.user.id,
-                    "email": response.user.email,
-                    "first_name": response.user.user_metadata.get("first_name"),
-                    "last_name": response.user.user_metadata.get("last_name"),
-                    "created_at": str(response.user.created_at) if response.user.created_at else None,
-                    "updated_at": str(response.user.updated_at) if response.user.updated_at else None
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Failed to update profile"
-                )
+        # Update user metadata in Supabase
+        user_data = {}
+        if first_name is not None:
+            user_data["first_name"] = first_name
+        if last_name is not None:
+            user_data["last_name"] = last_name
+        
+        # Supabase Auth rejects the PUT itself if the token is invalid
+        response = await self._update_user(access_token, {
+            "data": user_data
+        })
+        
+        if response.user:
+            # Update local database profile
+            try:
+                update_data = {}
+                if first_name is not None:
+                    update_data["first_name"] = first_name
+                if last_name is not None:
+                    update_data["last_name"] = last_name
                 
-        except Exception as e:
-            logger.error(f"Update profile error: {e}")
+                if update_data:
+                    await run_in_threadpool(ProfileCRUD.update_profile_shallow, response.user.id, update_data)
+                    logger.info("Updated local profile for user %s", response.user.id)
+            except Exception as e:
+                logger.error("Failed to update local profile: %s", e)
+            
+            return {
+                "id": response.user.id,
+                "email": response.user.email,
+                "first_name": response.user.user_metadata.get("first_name"),
+                "last_name": response.user.user_metadata.get("last_name"),
+                "created_at": str(response.user.created_at) if response.user.created_at else None,
+                "updated_at": str(response.user.updated_at) if response.user.updated_at else None
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to update profile"
             )
     
+    async def _get_signing_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """The JWK in the project's JWKS whose kid matches the token's, if any"""
+        jwks = await self._get_jwks()
+        if not jwks or not kid:
+            return None
+        return next((key for key in jwks["keys"] if key.get("kid") == kid), None)
+    
+    async def _get_jwks(self) -> Optional[Dict[str, Any]]:
+        """The project's JWKS, or None when it has no signing keys or can't be fetched"""
+        jwks = _jwks_cache.get("jwks")
+        if jwks is None:
+            try:
+                r = await self._http_client.get(f"{self.supabase_url}/auth/v1/.well-known/jwks.json")
+                r.raise_for_status()
+                jwks = r.json()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Could not fetch Supabase JWKS: %s", e)
+                jwks = {}
+            _jwks_cache["jwks"] = jwks
+        return jwks if jwks.get("keys") else None
+    
+    async def _user_from_token(self, access_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the current user from a locally verified Supabase access token.
+        HS256 tokens are checked with SUPABASE_JWT_SECRET, RS256/ES256 tokens
+        against the JWKS key named by the token's kid header. Returns None when
+        no key is available or the token does not verify, so the caller can
+        fall back to Supabase Auth.
+        """
+        try:
+            header = jwt.get_unverified_header(access_token)
+        except JWTError:
+            return None
+        alg = header.get("alg")
+        
+        # Each key type only accepts its own algorithms, so a token can't
+        # pass off the public JWKS as an HMAC secret
+        if alg == "HS256":
+            key, algorithms = self.jwt_secret, ["HS256"]
+        elif alg in ("RS256", "ES256"):
+            key, algorithms = await self._get_signing_key(header.get("kid")), ["RS256", "ES256"]
+        else:
+            return None
+        if not key:
+            return None
+        
+        try:
+            claims = jwt.decode(
+                access_token,
+                key,
+                algorithms=algorithms,
+                audience="authenticated"
+            )
+        except JWTError:
+            return None
+        
+        try:
+            role = await run_in_threadpool(_get_profile_role, claims["sub"])
+        except Exception as e:
+            logger.error("Failed to get local profile: %s", e)
+            role = "student"
+        
+        metadata = claims.get("user_metadata") or {}
+        return {
+            "id": claims["sub"],
+            "email": claims.get("email"),
+            "first_name": metadata.get("first_name"),
+            "last_name": metadata.get("last_name"),
+            "role": role,
+            "created_at": None,  # not carried in the token
+            "updated_at": None
+        }
+    
+    @_auth_errors("Get current user", status.HTTP_401_UNAUTHORIZED, "Invalid access token")
     async def get_current_user(self, access_token: str) -> Dict[str, Any]:
         """Get current user information from both Supabase and local database"""
         self._check_initialization()
         
-        try:
-            # Set the access token for the session
-            self.supabase.auth.set_session(access_token, None)
-            
-            # Get user from Supabase
-            user = self.supabase.auth.get_user()
+        if self.is_token_revoked(access_token):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid access token"
+            )
+        
+        # Verified locally: no round-trip to Supabase Auth
+        token_user = await self._user_from_token(access_token)
+        if token_user:
+            return token_user
+        
+        # Get user from Supabase; passing the token keeps this stateless
+        user = await _retry(lambda: self.auth.get_user(access_token))
+        
+        if user.user:
+            # Get additional data from local database
+            try:
+                role = await run_in_threadpool(_get_profile_role, user.user.id)
+            except Exception as e:
+                logger.error("Failed to get local profile: %s", e)
+                role = "student"
             
-            if user.user:
-                # Get additional data from local database
-                try:
-                    local_profile = ProfileCRUD.get_profile_by_user_id(user.user.id)
-                    role = local_profile.role if local_profile else "student"
-                except Exception as e:
-                    logger.error(f"Failed to get local profile: {e}")
-                    role = "student"
-                
-                return {
-                    "id": user.user.id,
-                    "email": user.user.email,
-                    "first_name": user.user.user_metadata.get("first_name"),
-                    "last_name": user.user.user_metadata.get("last_name"),
-                    "role": role,
-                    "created_at": str(user.user.created_at) if user.user.created_at else None,
-                    "updated_at": str(user.user.updated_at) if user.user.updated_at else None
-                }
-            else:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid access token"
-                )
-                
-        except Exception as e:
-            logger.error(f"Get current user error: {e}")
+            return {
+                "id": user.user.id,
+                "email": user.user.email,
+                "first_name": user.user.user_metadata.get("first_name"),
+                "last_name": user.user.user_metadata.get("last_name"),
+                "role": role,
+                "created_at": str(user.user.created_at) if user.user.created_at else None,
+                "updated_at": str(user.user.updated_at) if user.user.updated_at else None
+            }
+        else:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid access token"
-            ) 
\ No newline at end of file
+            )
+
+@lru_cache(maxsize=1)
+def get_auth_service() -> AuthService:
+    """Process-wide AuthService, so every caller shares one Supabase Auth client"""
+    return AuthService()
@@ -1,13 +1,62 @@
-from typing import List, Optional
+from threading import Lock
+from typing import Optional
+from cachetools import TTLCache, cached
 from db.orms import UniversityCRUD
+from db.orms.university import on_universities_write
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-process caches for read-mostly data. Reference data (countries,
+# statistics, per-country listings) only changes when the sync script runs;
+# paginated listings are kept for a shorter window. Writes made through
+# UniversityCRUD in this process clear them all immediately.
+_cache_lock = Lock()
+_countries_cache = TTLCache(maxsize=1, ttl=600)
+_statistics_cache = TTLCache(maxsize=1, ttl=600)
+_by_country_cache = TTLCache(maxsize=32, ttl=300)
+_listing_cache = TTLCache(maxsize=128, ttl=60)
+
+def _university_to_dict(university) -> dict:
+    """
+    Project a University ORM row onto the UniversityResponse schema.
+    
+    Values are read from the instance __dict__ instead of through the ORM's
+    instrumented attributes, which is several times cheaper per row. Rows
+    come from read-only sessions, so every selected column is already loaded;
+    a column that was never loaded projects as None instead of lazy-loading.
+    UUID and datetime values are left as-is; ORJSONResponse encodes them natively.
+    """
+    row = university.__dict__
+    return {
+        "id": row.get("id"),
+        "name": row.get("name"),
+        "country_code": row.get("country_code"),
+        "state_province": row.get("state_province"),
+        "city": row.get("city"),
+        "website": row.get("website"),
+        "domain": row.get("domain"),
+        "aliases": row.get("aliases") or [],
+        "external_ids": row.get("external_ids") or {},
+        "apply_portals": row.get("apply_portals") or [],
+        "created_at": row.get("created_at"),
+        "updated_at": row.get("updated_at")
+    }
+
 class UniversityService:
     """Service layer for university business logic"""
+
+    @staticmethod
+    def invalidate_cache():
+        """Drop all cached university data; call after any write to universities"""
+        with _cache_lock:
+            _countries_cache.clear()
+            _statistics_cache.clear()
+            _by_country_cache.clear()
+            _listing_cache.clear()
     
     @staticmethod
+    @cached(_listing_cache, lock=_cache_lock)
     def get_universities_with_pagination(
         page: int = 1,
         per_page: int = 20,
@@ -18,52 +67,37 @@ class UniversityService:
     ):
         """Get universities with pagination and filtering"""
         try:
-            # Get universities based on filters
-            if search or country_code:
-                universities = UniversityCRUD.search_universities(
-                    search_term=search or "", 
-                    country_code=country_code, 
-                    limit=per_page * 10  # Temporary limit
-                )
-            else:
-                universities = UniversityCRUD.get_all_universities()
-            
-            # Apply sorting
-            if sort_by == "name":
-                universities.sort(key=lambda x: x.name.lower() if x.name else "")
-            elif sort_by == "country_code":
-                universities.sort(key=lambda x: x.country_code)
-            elif sort_by == "created_at":
-                universities.sort(key=lambda x: x.created_at or "")
-            
-            if sort_order == "desc":
-                universities.reverse()
-            
-            # Apply pagination
-            total = len(universities)
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            paginated_universities = universities[start_idx:end_idx]
+            # Filtering, sorting and pagination all happen in SQL
+            universities, total, estimated = UniversityCRUD.list_universities(
+                search_term=search,
+                country_code=country_code,
+                sort_by=sort_by,
+                sort_order=sort_order,
+                limit=per_page,
+                offset=(page - 1) * per_page
+            )
             
             return {
-                "items": paginated_universities,
+                "items": [_university_to_dict(uni) for uni in universities],
                 "total": total,
                 "page": page,
                 "per_page": per_page,
-                "pages": (total + per_page - 1) // per_page
+                "pages": (total + per_page - 1) // per_page,
+                "estimated": estimated
             }
             
         except Exception as e:
-            logger.error(f"Error in get_universities_with_pagination: {e}")
+            logger.error("Error in get_universities_with_pagination: %s", e)
             raise
 
     @staticmethod
     def get_university_by_id(university_id: str):
-        """Get a specific university by ID"""
+        """Get a specific university by ID, projected for the response"""
         try:
-            return UniversityCRUD.get_university_by_id(university_id)
+            university = UniversityCRUD.get_university_by_id(university_id)
+            return _university_to_dict(university) if university else None
         except Exception as e:
-            logger.error(f"Error in get_university_by_id: {e}")
+            logger.error("Error in get_university_by_id: %s", e)
             raise
 
     @staticmethod
@@ -74,56 +108,47 @@ class UniversityService:
     ):
         """Get search suggestions for autocomplete"""
         try:
-            suggestions = UniversityCRUD.search_universities(
+            suggestions = UniversityCRUD.search_university_suggestions(
                 search_term=query,
                 country_code=country_code,
                 limit=limit
             )
             
-            return [
-                {
-                    "id": str(uni.id),
-                    "name": uni.name,
-                    "country_code": uni.country_code,
-                    "domain": uni.domain
-                } for uni in suggestions
-            ]
+            # Rows already carry exactly the suggestion fields, in order
+            return [row._asdict() for row in suggestions]
         except Exception as e:
-            logger.error(f"Error in get_search_suggestions: {e}")
+            logger.error("Error in get_search_suggestions: %s", e)
             raise
 
     @staticmethod
+    @cached(_countries_cache, lock=_cache_lock)
     def get_countries():
         """Get list of countries with universities"""
         try:
             return UniversityCRUD.get_countries_with_universities()
         except Exception as e:
-            logger.error(f"Error in get_countries: {e}")
+            logger.error("Error in get_countries: %s", e)
             raise
 
     @staticmethod
+    @cached(_statistics_cache, lock=_cache_lock)
     def get_statistics():
         """Get university statistics"""
         try:
-            all_universities = UniversityCRUD.get_all_universities()
-            countries = UniversityCRUD.get_countries_with_universities()
-            
-            total = len(all_universities)
-            total_countries = len(countries)
-            with_website = len([u for u in all_universities if u.website])
-            with_domain = len([u for u in all_universities if u.domain])
-            
-            return {
-                "total_universities": total,
-                "total_countries": total_countries,
-                "with_website": with_website,
-                "with_domain": with_domain
-            }
+            # One aggregate row; no universities are shipped to Python
+            return UniversityCRUD.get_statistics()
         except Exception as e:
-            logger.error(f"Error in get_statistics: {e}")
+            logger.error("Error in get_statistics: %s", e)
             raise
 
     @staticmethod
+    def iter_universities_by_country(country_code: str):
+        """Stream universities in a specific country as response dicts"""
+        for uni in UniversityCRUD.iter_universities_by_country(country_code):
+            yield _university_to_dict(uni)
+
+    @staticmethod
+    @cached(_by_country_cache, lock=_cache_lock)
     def get_universities_by_country(
         country_code: str,
         search: Optional[str] = None
@@ -137,9 +162,12 @@ class UniversityService:
                     limit=1000
                 )
             else:
-                universities = UniversityCRUD.get_universities_by_country(country_code)
+                # Full rows: the response schema includes aliases and the JSONB fields
+                universities = UniversityCRUD.get_universities_by_country(country_code, eager=True)
             
-            return universities
+            return [_university_to_dict(uni) for uni in universities]
         except Exception as e:
-            logger.error(f"Error in get_universities_by_country: {e}")
-            raise 
\ No newline at end of file
+            logger.error("Error in get_universities_by_country: %s", e)
+            raise 
+
+on_universities_write(UniversityService.invalidate_cache)
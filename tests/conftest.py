@@ -0,0 +1,23 @@
+import os
+import sys
+
+# Make the project packages (api, core, db, services) importable
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from services import auth_service as auth_module
+
+JWT_SECRET = "test-jwt-secret"
+SUPABASE_URL = "https://project.supabase.test"
+
+
+@pytest.fixture
+def auth_service(monkeypatch):
+    """An AuthService configured for a fake project, with local roles stubbed out"""
+    monkeypatch.setattr(auth_module, "SUPABASE_URL", SUPABASE_URL)
+    monkeypatch.setattr(auth_module, "SUPABASE_ANON_KEY", "anon-key")
+    monkeypatch.setattr(auth_module, "SUPABASE_JWT_SECRET", JWT_SECRET)
+    monkeypatch.setattr(auth_module, "_get_profile_role", lambda user_id: "teacher")
+    auth_module._jwks_cache.clear()
+    return auth_module.AuthService()
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+from gotrue.helpers import handle_exception
+
+from services import auth_service as auth_module
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    async def sleep(delay):
+        pass
+
+    monkeypatch.setattr(auth_module.asyncio, "sleep", sleep)
+
+
+def failing_call(errors, result="ok"):
+    """A call that raises each of `errors` in turn, then returns `result`"""
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) <= len(errors):
+            raise errors[len(attempts) - 1]
+        return result
+
+    return call, attempts
+
+
+def gotrue_error(cause):
+    """Raise cause and let gotrue wrap it, the way its request helper does"""
+    try:
+        raise cause
+    except Exception as e:
+        try:
+            raise handle_exception(e)
+        except Exception as wrapped:
+            return wrapped
+
+
+def test_connect_errors_are_retried():
+    call, attempts = failing_call([httpx.ConnectError("refused"), httpx.ConnectTimeout("slow")])
+
+    assert asyncio.run(auth_module._retry(call)) == "ok"
+    assert len(attempts) == 3
+
+
+def test_connect_errors_wrapped_by_gotrue_are_retried():
+    call, attempts = failing_call([gotrue_error(httpx.ConnectError("refused"))])
+
+    assert asyncio.run(auth_module._retry(call)) == "ok"
+    assert len(attempts) == 2
+
+
+def test_retries_stop_after_max_retries():
+    call, attempts = failing_call([httpx.ConnectError("refused")] * 5)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(auth_module._retry(call))
+    assert len(attempts) == 3
+
+
+@pytest.mark.parametrize("error", [
+    httpx.ReadTimeout("sent, no reply"),
+    gotrue_error(httpx.ReadError("connection reset")),
+    gotrue_error(ValueError("malformed JSON")),
+])
+def test_errors_after_the_request_was_sent_are_not_retried(error):
+    call, attempts = failing_call([error])
+
+    with pytest.raises(type(error)):
+        asyncio.run(auth_module._retry(call))
+    assert len(attempts) == 1
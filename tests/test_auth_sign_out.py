@@ -0,0 +1,95 @@
+import asyncio
+import time
+import uuid
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from conftest import JWT_SECRET
+from core import middleware
+
+
+def make_token():
+    # A fresh subject per test, so tokens never collide in the module-level caches
+    return jwt.encode(
+        {"sub": str(uuid.uuid4()), "aud": "authenticated", "exp": int(time.time()) + 3600},
+        JWT_SECRET,
+        algorithm="HS256",
+    )
+
+
+@pytest.fixture
+def logout_requests(auth_service, monkeypatch):
+    """Serve POST /auth/v1/logout with a 204 and record each request"""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(204)
+
+    auth_service._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(middleware, "auth_service", auth_service)
+    return requests
+
+
+def test_sign_out_ends_the_supabase_session(auth_service, logout_requests):
+    token = make_token()
+
+    assert asyncio.run(auth_service.sign_out(token)) is True
+
+    [request] = logout_requests
+    assert request.method == "POST"
+    assert request.url.path == "/auth/v1/logout"
+    assert request.url.params["scope"] == "local"
+    assert request.headers["Authorization"] == f"Bearer {token}"
+
+
+def test_signed_out_token_is_rejected_even_when_cached(auth_service, logout_requests):
+    token = make_token()
+
+    async def scenario():
+        user = await middleware.verify_token(token)
+        await auth_service.sign_out(token)
+        with pytest.raises(HTTPException) as excinfo:
+            await middleware.verify_token(token)
+        return user, excinfo.value
+
+    user, error = asyncio.run(scenario())
+
+    assert user["role"] == "teacher"
+    assert auth_service.is_token_revoked(token)
+    assert error.status_code == 401
+
+
+def test_sign_out_leaves_other_tokens_valid(auth_service, logout_requests):
+    token, other = make_token(), make_token()
+
+    async def scenario():
+        await auth_service.sign_out(token)
+        return await middleware.verify_token(other)
+
+    assert asyncio.run(scenario())["role"] == "teacher"
+    assert not auth_service.is_token_revoked(other)
+
+
+def test_sign_out_of_an_already_ended_session_succeeds(auth_service):
+    auth_service._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(401))
+    )
+    token = make_token()
+
+    assert asyncio.run(auth_service.sign_out(token)) is True
+    assert auth_service.is_token_revoked(token)
+
+
+def test_sign_out_reports_supabase_failures(auth_service):
+    auth_service._http_client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(500))
+    )
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(auth_service.sign_out(make_token()))
+
+    assert excinfo.value.status_code == 400
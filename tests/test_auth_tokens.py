@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from conftest import JWT_SECRET
+
+
+def make_claims(**overrides):
+    claims = {
+        "sub": "5f1c3c52-8d0e-4c7e-9a55-0c2b8a1b6f10",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+        "email": "student@example.com",
+        "user_metadata": {"first_name": "Ada", "last_name": "Lovelace"},
+    }
+    claims.update(overrides)
+    return claims
+
+
+def rsa_key_pair(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = kid
+    return private_pem, public_jwk
+
+
+def serve_jwks(auth_service, keys):
+    def handler(request):
+        assert request.url.path == "/auth/v1/.well-known/jwks.json"
+        return httpx.Response(200, json={"keys": keys})
+
+    auth_service._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_hs256_token_is_verified_locally(auth_service):
+    token = jwt.encode(make_claims(), JWT_SECRET, algorithm="HS256")
+
+    user = asyncio.run(auth_service._user_from_token(token))
+
+    assert user == {
+        "id": "5f1c3c52-8d0e-4c7e-9a55-0c2b8a1b6f10",
+        "email": "student@example.com",
+        "first_name": "Ada",
+        "last_name": "Lovelace",
+        "role": "teacher",
+        "created_at": None,
+        "updated_at": None,
+    }
+
+
+def test_hs256_token_with_wrong_secret_is_rejected(auth_service):
+    token = jwt.encode(make_claims(), "some-other-secret", algorithm="HS256")
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
+
+
+def test_expired_token_is_rejected(auth_service):
+    token = jwt.encode(make_claims(exp=int(time.time()) - 10), JWT_SECRET, algorithm="HS256")
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
+
+
+def test_token_for_another_audience_is_rejected(auth_service):
+    token = jwt.encode(make_claims(aud="anon"), JWT_SECRET, algorithm="HS256")
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
+
+
+def test_malformed_token_is_rejected(auth_service):
+    assert asyncio.run(auth_service._user_from_token("not-a-jwt")) is None
+
+
+def test_rs256_token_is_verified_with_the_key_named_by_kid(auth_service):
+    private_pem, public_jwk = rsa_key_pair("current")
+    _, other_jwk = rsa_key_pair("previous")
+    serve_jwks(auth_service, [other_jwk, public_jwk])
+    token = jwt.encode(make_claims(), private_pem, algorithm="RS256", headers={"kid": "current"})
+
+    user = asyncio.run(auth_service._user_from_token(token))
+
+    assert user["id"] == "5f1c3c52-8d0e-4c7e-9a55-0c2b8a1b6f10"
+
+
+def test_rs256_token_with_unknown_kid_is_rejected(auth_service):
+    private_pem, public_jwk = rsa_key_pair("current")
+    serve_jwks(auth_service, [public_jwk])
+    token = jwt.encode(make_claims(), private_pem, algorithm="RS256", headers={"kid": "rotated-out"})
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
+
+
+def test_rs256_token_signed_by_another_key_is_rejected(auth_service):
+    _, public_jwk = rsa_key_pair("current")
+    forged_pem, _ = rsa_key_pair("current")
+    serve_jwks(auth_service, [public_jwk])
+    token = jwt.encode(make_claims(), forged_pem, algorithm="RS256", headers={"kid": "current"})
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
+
+
+def test_hs256_token_signed_with_the_public_jwks_is_rejected(auth_service):
+    _, public_jwk = rsa_key_pair("current")
+    serve_jwks(auth_service, [public_jwk])
+    auth_service.jwt_secret = None
+    token = jwt.encode(make_claims(), "anything", algorithm="HS256")
+
+    assert asyncio.run(auth_service._user_from_token(token)) is None
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+
+import pytest
+
+from core import coalescing
+from core.coalescing import run_coalesced
+
+
+def test_concurrent_callers_share_one_call():
+    calls = []
+    release = threading.Event()
+
+    def lookup(value):
+        calls.append(value)
+        release.wait(5)
+        return {"value": value}
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(run_coalesced("key", lookup, 1)) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    results = asyncio.run(scenario())
+
+    assert calls == [1]
+    assert all(result is results[0] for result in results)
+    assert coalescing._inflight == {}
+
+
+def test_different_keys_run_separately():
+    calls = []
+
+    def lookup(value):
+        calls.append(value)
+        return value
+
+    async def scenario():
+        return await asyncio.gather(
+            run_coalesced(("a",), lookup, "a"),
+            run_coalesced(("b",), lookup, "b"),
+        )
+
+    assert asyncio.run(scenario()) == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+def test_finished_calls_are_not_reused():
+    calls = []
+
+    def lookup():
+        calls.append(1)
+        return len(calls)
+
+    async def scenario():
+        first = await run_coalesced("key", lookup)
+        second = await run_coalesced("key", lookup)
+        return first, second
+
+    assert asyncio.run(scenario()) == (1, 2)
+
+
+def test_errors_reach_every_waiter():
+    release = threading.Event()
+
+    def lookup():
+        release.wait(5)
+        raise RuntimeError("db down")
+
+    async def scenario():
+        tasks = [asyncio.ensure_future(run_coalesced("key", lookup)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert coalescing._inflight == {}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    release = threading.Event()
+
+    def lookup():
+        release.wait(5)
+        return "done"
+
+    async def scenario():
+        first = asyncio.ensure_future(run_coalesced("key", lookup))
+        second = asyncio.ensure_future(run_coalesced("key", lookup))
+        await asyncio.sleep(0.05)
+        first.cancel()
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,16 @@
+from db.orm_db_manager import DatabaseConnectionManager
+
+
+def test_managers_for_one_database_share_an_engine():
+    first = DatabaseConnectionManager(app_name="first")
+    second = DatabaseConnectionManager(app_name="second")
+
+    assert first.engine is second.engine
+    assert "application_name" not in str(first.engine.url)
+
+
+def test_managers_for_different_databases_get_their_own_engine():
+    default = DatabaseConnectionManager(app_name="default")
+    other = DatabaseConnectionManager(app_name="other", database_name="some_other_database")
+
+    assert default.engine is not other.engine
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from scripts import sync_hipo_universities_orm as sync
+
+
+@pytest.fixture
+def hipo(monkeypatch, tmp_path):
+    """Fake Hipo responses and DB calls; records the ETag sent per country"""
+    state = {"sent": {}, "responses": {}, "stored_codes": [], "upserts": []}
+
+    async def fetch_country(client, semaphore, country, etag=None):
+        state["sent"][country] = etag
+        items, new_etag = state["responses"][country]
+        if items is None:
+            return None, etag
+        return items, new_etag
+
+    def bulk_upsert(rows):
+        state["upserts"].append(rows)
+        return len(rows)
+
+    monkeypatch.setattr(sync, "fetch_country", fetch_country)
+    monkeypatch.setattr(sync.UniversityCRUD, "bulk_upsert", staticmethod(bulk_upsert))
+    monkeypatch.setattr(
+        sync.UniversityCRUD, "get_countries_with_universities", staticmethod(lambda: state["stored_codes"])
+    )
+    state["etag_path"] = str(tmp_path / "etags.json")
+    return state
+
+
+def hipo_items(code="AU"):
+    return [{"name": "University of Sydney", "alpha_two_code": code, "domains": ["sydney.edu.au"]}]
+
+
+def test_etag_is_saved_with_its_country_code_after_the_upsert(hipo):
+    hipo["responses"]["Australia"] = (hipo_items(), '"v1"')
+
+    result = asyncio.run(sync.sync_countries_orm(["Australia"], etag_cache=hipo["etag_path"]))
+
+    assert result["upserted"] == 1
+    assert sync.load_etags(hipo["etag_path"]) == {"Australia": {"etag": '"v1"', "country_code": "AU"}}
+
+
+def test_stored_etag_is_sent_while_the_country_has_rows(hipo):
+    sync.save_etags(hipo["etag_path"], {"Australia": {"etag": '"v1"', "country_code": "AU"}})
+    hipo["stored_codes"] = ["AU"]
+    hipo["responses"]["Australia"] = (None, None)
+
+    asyncio.run(sync.sync_countries_orm(["Australia"], etag_cache=hipo["etag_path"]))
+
+    assert hipo["sent"] == {"Australia": '"v1"'}
+    assert hipo["upserts"] == []
+
+
+def test_stored_etag_is_ignored_when_the_database_lost_the_country(hipo):
+    sync.save_etags(hipo["etag_path"], {"Australia": {"etag": '"v1"', "country_code": "AU"}})
+    hipo["responses"]["Australia"] = (hipo_items(), '"v1"')
+
+    result = asyncio.run(sync.sync_countries_orm(["Australia"], etag_cache=hipo["etag_path"]))
+
+    assert hipo["sent"] == {"Australia": None}
+    assert result["upserted"] == 1
+
+
+def test_failed_upsert_does_not_save_the_etag(hipo, monkeypatch):
+    def bulk_upsert(rows):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(sync.UniversityCRUD, "bulk_upsert", staticmethod(bulk_upsert))
+    hipo["responses"]["Australia"] = (hipo_items(), '"v1"')
+
+    asyncio.run(sync.sync_countries_orm(["Australia"], etag_cache=hipo["etag_path"]))
+
+    assert sync.load_etags(hipo["etag_path"]) == {}
+
+
+def test_warns_when_every_country_is_unchanged(hipo, capsys):
+    sync.save_etags(hipo["etag_path"], {
+        "Australia": {"etag": '"v1"', "country_code": "AU"},
+        "Canada": {"etag": '"v2"', "country_code": "CA"},
+    })
+    hipo["stored_codes"] = ["AU", "CA"]
+    hipo["responses"] = {"Australia": (None, None), "Canada": (None, None)}
+
+    asyncio.run(sync.sync_countries_orm(["Australia", "Canada"], etag_cache=hipo["etag_path"]))
+
+    assert "every country came back unchanged" in capsys.readouterr().out
@@ -0,0 +1,48 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from services.university_service import UniversityService
+
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+
+def test_overview_returns_statistics_and_countries(client, monkeypatch):
+    stats = {"total_universities": 3, "total_countries": 2, "with_website": 2, "with_domain": 1}
+    monkeypatch.setattr(UniversityService, "get_statistics", staticmethod(lambda: stats))
+    monkeypatch.setattr(UniversityService, "get_countries", staticmethod(lambda: ["AU", "US"]))
+
+    response = client.get("/universities/overview")
+
+    assert response.status_code == 200
+    assert response.json() == {"statistics": stats, "countries": ["AU", "US"]}
+
+
+def test_get_university_by_id(client, monkeypatch):
+    university_id = uuid.uuid4()
+    requested = []
+
+    def get_university_by_id(university_id):
+        requested.append(university_id)
+        return {"id": university_id, "name": "University of Sydney", "country_code": "AU"}
+
+    monkeypatch.setattr(UniversityService, "get_university_by_id", staticmethod(get_university_by_id))
+
+    response = client.get(f"/universities/{university_id}")
+
+    assert response.status_code == 200
+    assert response.json() == {"id": str(university_id), "name": "University of Sydney", "country_code": "AU"}
+    assert requested == [university_id]
+
+
+def test_unknown_university_is_404(client, monkeypatch):
+    monkeypatch.setattr(UniversityService, "get_university_by_id", staticmethod(lambda university_id: None))
+
+    response = client.get(f"/universities/{uuid.uuid4()}")
+
+    assert response.status_code == 404
@@ -0,0 +1,137 @@
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from db.orms.university import UniversityCRUD
+from scripts.sync_hipo_universities_orm import normalize
+
+
+class RecordingSession(Session):
+    """A Session that records each statement instead of running it and reports every row as written"""
+
+    def __init__(self):
+        super().__init__()
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return type("Result", (), {"rowcount": len(stmt._multi_values[0])})()
+
+
+def compile_pg(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+def hipo_item(name, domain=None, country="AU"):
+    return {
+        "name": name,
+        "alpha_two_code": country,
+        "state-province": None,
+        "web_pages": [f"https://{domain}/"] if domain else [],
+        "domains": [domain] if domain else [],
+    }
+
+
+def test_normalize_hash_tracks_the_source_data():
+    first = normalize(hipo_item("University of Sydney", "sydney.edu.au"))
+    again = normalize(hipo_item("University of Sydney", "sydney.edu.au"))
+    renamed = normalize(hipo_item("The University of Sydney", "sydney.edu.au"))
+
+    assert first["content_hash"] == again["content_hash"]
+    assert first["content_hash"] != renamed["content_hash"]
+
+
+def test_hashed_rows_only_update_when_the_hash_differs():
+    session = RecordingSession()
+    rows = [
+        normalize(hipo_item("University of Sydney", "sydney.edu.au")),
+        normalize(hipo_item("Charles Sturt University")),
+    ]
+
+    assert UniversityCRUD.bulk_upsert(rows, session=session) == 2
+
+    domain_sql, name_sql = (compile_pg(stmt) for stmt in session.statements)
+    assert "ON CONFLICT (domain) DO UPDATE" in domain_sql
+    assert "WHERE universities.content_hash IS DISTINCT FROM excluded.content_hash" in domain_sql
+    assert "ON CONFLICT (lower(name), country_code) WHERE domain IS NULL DO UPDATE" in name_sql
+    assert "WHERE universities.content_hash IS DISTINCT FROM excluded.content_hash" in name_sql
+    assert "content_hash = excluded.content_hash" in domain_sql
+
+
+def test_rows_without_a_hash_always_update():
+    session = RecordingSession()
+    rows = [{"name": "University of Sydney", "country_code": "AU", "domain": "sydney.edu.au"}]
+
+    UniversityCRUD.bulk_upsert(rows, session=session)
+
+    [sql] = (compile_pg(stmt) for stmt in session.statements)
+    assert "ON CONFLICT (domain) DO UPDATE" in sql
+    assert "IS DISTINCT FROM" not in sql
+
+
+def test_duplicate_keys_collapse_to_the_last_row():
+    session = RecordingSession()
+    rows = [
+        normalize(hipo_item("Old name", "sydney.edu.au")),
+        normalize(hipo_item("University of Sydney", "SYDNEY.edu.au")),
+    ]
+
+    assert UniversityCRUD.bulk_upsert(rows, session=session) == 1
+
+    [stmt] = session.statements
+    [row] = stmt._multi_values[0]
+    assert row["name"] == "University of Sydney"
+
+
+def test_rows_with_only_key_columns_do_nothing_on_conflict():
+    session = RecordingSession()
+
+    UniversityCRUD.bulk_upsert([{"domain": "sydney.edu.au"}], session=session)
+
+    [sql] = (compile_pg(stmt) for stmt in session.statements)
+    assert "ON CONFLICT (domain) DO NOTHING" in sql
+
+
+class UpsertSession(Session):
+    """A Session that records create_or_update_university's statements instead of running them"""
+
+    def __init__(self, returned, existing=None):
+        super().__init__()
+        self.returned = returned
+        self.existing = existing
+        self.statements = []
+        self.expunged = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return type("Result", (), {"scalar_one_or_none": lambda _: self.returned})()
+
+    def scalars(self, stmt):
+        self.statements.append(stmt)
+        return type("Result", (), {"one": lambda _: self.existing})()
+
+    def expunge(self, obj):
+        self.expunged.append(obj)
+
+
+def test_create_or_update_overwrites_supplied_columns():
+    university = object()
+    session = UpsertSession(returned=university)
+    data = {"name": "University of Sydney", "country_code": "AU", "domain": "sydney.edu.au"}
+
+    assert UniversityCRUD.create_or_update_university(data, session=session) is university
+
+    [sql] = (compile_pg(stmt) for stmt in session.statements)
+    assert "ON CONFLICT (domain) DO UPDATE SET name = excluded.name, country_code = excluded.country_code" in sql
+    assert session.expunged == [university]
+
+
+def test_create_or_update_without_updatable_columns_reads_the_existing_row():
+    existing = object()
+    session = UpsertSession(returned=None, existing=existing)
+
+    assert UniversityCRUD.create_or_update_university({"domain": "sydney.edu.au"}, session=session) is existing
+
+    insert_sql, select_sql = (compile_pg(stmt) for stmt in session.statements)
+    assert "ON CONFLICT (domain) DO NOTHING" in insert_sql
+    assert "WHERE universities.domain = " in select_sql
+    assert session.expunged == [existing]
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.orm import Session
+
+from db.orms import university as university_module
+from db.orms.university import UniversityCRUD
+
+
+class ListSession:
+    """Stands in for a Session whose every query returns `rows`"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+
+    def execute(self, stmt):
+        self.queries += 1
+        assert stmt.get_execution_options()["yield_per"] == 1000
+        return list(self.rows)
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    session = ListSession([("id-1", "University of Sydney"), ("id-2", "Monash University")])
+
+    class Manager:
+        @contextmanager
+        def get_session(self):
+            yield session
+
+    monkeypatch.setattr(UniversityCRUD, "db_manager", Manager())
+    university_module._universities_cache.clear()
+    yield session
+    university_module._universities_cache.clear()
+
+
+def test_iter_all_universities_streams_rows(db_session):
+    assert list(UniversityCRUD.iter_all_universities()) == db_session.rows
+
+
+def test_get_all_universities_is_cached_until_a_write(db_session):
+    first = UniversityCRUD.get_all_universities()
+    second = UniversityCRUD.get_all_universities()
+
+    assert first == db_session.rows
+    assert second is first
+    assert db_session.queries == 1
+
+    university_module._clears_universities_cache(lambda: None)()
+    UniversityCRUD.get_all_universities()
+
+    assert db_session.queries == 2
+
+
+def test_get_all_universities_in_a_callers_session_bypasses_the_cache(db_session):
+    callers_session = ListSession([("id-3", "Uncommitted University")])
+
+    assert UniversityCRUD.get_all_universities(session=callers_session) == callers_session.rows
+    assert UniversityCRUD.get_all_universities() == db_session.rows
+    assert UniversityCRUD.get_all_universities(session=callers_session) == callers_session.rows
+    assert callers_session.queries == 2
+
+
+@pytest.fixture
+def write_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(university_module, "_write_listeners", [lambda: events.append("written")])
+    return events
+
+
+def test_writes_in_a_callers_session_notify_only_after_commit(write_events):
+    session = Session()
+
+    UniversityCRUD.update_university_shallow("id-1", {}, session=session)
+    UniversityCRUD.update_university_shallow("id-2", {}, session=session)
+    assert write_events == []
+
+    session.commit()
+    assert write_events == ["written"]
+
+    session.commit()
+    assert write_events == ["written"]
+
+
+def test_writes_in_a_rolled_back_session_do_not_notify(write_events):
+    session = Session()
+    session.begin()
+
+    UniversityCRUD.update_university_shallow("id-1", {}, session=session)
+    session.rollback()
+    session.commit()
+
+    assert write_events == []
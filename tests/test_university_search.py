@@ -0,0 +1,43 @@
+from sqlalchemy.dialects import postgresql
+
+from db.orms.university import _name_matches, _prefix_tsquery
+
+
+def compile_pg(clause):
+    compiled = clause.compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_prefix_tsquery_makes_last_word_a_prefix():
+    assert _prefix_tsquery("University of Cal") == "University & of & Cal:*"
+
+
+def test_prefix_tsquery_drops_tsquery_operators():
+    assert _prefix_tsquery("a & b | !c (d):*") == "a & b & c & d:*"
+    assert _prefix_tsquery("o'neil_college") == "o & neil & college:*"
+
+
+def test_prefix_tsquery_without_words():
+    assert _prefix_tsquery("& | !") is None
+
+
+def test_multi_word_terms_use_prefix_full_text_search():
+    sql, params = compile_pg(_name_matches("University of Cal"))
+
+    assert "universities.name_tsv @@ to_tsquery(" in sql
+    assert "simple" in params.values()
+    assert "University & of & Cal:*" in params.values()
+
+
+def test_single_word_terms_use_escaped_ilike():
+    sql, params = compile_pg(_name_matches("100%_sure"))
+
+    assert "universities.name ILIKE" in sql
+    assert list(params.values()) == ["%100\\%\\_sure%"]
+
+
+def test_multi_word_terms_without_words_fall_back_to_ilike():
+    sql, params = compile_pg(_name_matches("& |"))
+
+    assert "ILIKE" in sql
+    assert list(params.values()) == ["%& |%"]